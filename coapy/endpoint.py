@@ -26,10 +26,11 @@ import logging
 _log = logging.getLogger(__name__)
 
 import socket
+import re
 import urlparse
-import urllib
 import random
 import itertools
+import weakref
 import coapy
 import coapy.message
 
@@ -42,7 +43,104 @@ urlparse.uses_query.extend(['coap', 'coaps'])
 
 
 class URIError (coapy.CoAPyException):
-    pass
+    """Exception raised when a URI cannot be converted to or from
+    CoAP options.
+
+    The first of the *args* is one of the string values in this
+    class.  Where there is one, the second is the text that was
+    rejected.
+    """
+
+    NOT_ABSOLUTE = 'not absolute'
+    """The URI, after resolution against a base URI, has no scheme or
+    has a fragment."""
+
+    INVALID_SCHEME = 'invalid scheme'
+    """The URI scheme is not ``coap`` or ``coaps``."""
+
+    INVALID_HOST = 'invalid host'
+    """The URI authority has a malformed ``IP-literal``."""
+
+    INVALID_PORT = 'invalid port'
+    """The URI port is not a number in the range of UDP ports."""
+
+    EMPTY_URI_HOST = 'empty Uri-Host'
+    """A :class:`coapy.option.UriHost` option has no value."""
+
+    EMPTY_URI_PORT = 'empty Uri-Port'
+    """A :class:`coapy.option.UriPort` option has no value."""
+
+
+_URIScheme_re = re.compile(r'[A-Za-z][-+.A-Za-z0-9]*:')
+
+
+def _split_path_query(text):
+    """Split the part of a URI following the authority into ``(path,
+    query, fragment)``.  *query* and *fragment* are ``None`` if
+    absent."""
+    fragment = None
+    idx = text.find('#')
+    if 0 <= idx:
+        fragment = text[idx + 1:]
+        text = text[:idx]
+    query = None
+    idx = text.find('?')
+    if 0 <= idx:
+        query = text[idx + 1:]
+        text = text[:idx]
+    return (text, query, fragment)
+
+
+def _split_coap_uri(uri):
+    """Split *uri* into ``(scheme, host, port, path, query, fragment)``.
+
+    This is a minimal :rfc:`3986` splitter sufficient for ``coap`` and
+    ``coaps`` URIs, used in place of :func:`python:urlparse.urlsplit`.
+    *scheme* is lower-cased and empty if *uri* has none.  *host* is
+    ``None`` if *uri* has no authority, and otherwise is the
+    lower-cased host without userinfo or the brackets of an
+    ``IP-literal``.  *port* is an integer, or ``None`` if absent.
+    *query* and *fragment* are ``None`` if absent.
+
+    An authority with an unterminated ``IP-literal`` or an invalid port
+    raises :exc:`URIError`.
+    """
+    scheme = ''
+    mo = _URIScheme_re.match(uri)
+    if mo is not None:
+        scheme = mo.group(0)[:-1].lower()
+        uri = uri[mo.end():]
+    (uri, query, fragment) = _split_path_query(uri)
+    host = None
+    port = None
+    if uri.startswith('//'):
+        idx = uri.find('/', 2)
+        if 0 > idx:
+            idx = len(uri)
+        authority = uri[2:idx]
+        uri = uri[idx:]
+        idx = authority.rfind('@')
+        if 0 <= idx:
+            authority = authority[idx + 1:]
+        if authority.startswith('['):
+            idx = authority.find(']')
+            if 0 > idx:
+                raise URIError(URIError.INVALID_HOST, authority)
+            host = authority[1:idx]
+            port_text = authority[idx + 1:]
+            if port_text and (':' != port_text[0]):
+                raise URIError(URIError.INVALID_HOST, authority)
+            port_text = port_text[1:]
+        else:
+            (host, _, port_text) = authority.partition(':')
+        host = host.lower()
+        if port_text:
+            if not port_text.isdigit():
+                raise URIError(URIError.INVALID_PORT, port_text)
+            port = int(port_text)
+            if 65535 < port:
+                raise URIError(URIError.INVALID_PORT, port_text)
+    return (scheme, host, port, uri, query, fragment)
 
 
 class ReplyMessageError (coapy.CoAPyException):
@@ -178,6 +276,35 @@ class MessageCache (object):
         """
         return self.__queue
 
+    def next_due(self):
+        """The earliest :attr:`MessageCacheEntry.time_due` in the
+        :meth:`queue`, or ``None`` if the queue is empty.
+
+        A driver can wait until this time before calling
+        :meth:`process_timeouts`, rather than polling.
+        """
+        if self.__queue:
+            return self.__queue[0].time_due
+        return None
+
+    def process_timeouts(self, now=None):
+        """Invoke :meth:`MessageCacheEntry.process_timeout` on each
+        entry in the :meth:`queue` that is due at *now*, which
+        defaults to :func:`coapy.clock`.
+
+        The due entries are identified in one step from the head of
+        the sorted queue.  Each is processed once per call even if its
+        processing leaves it still due, and entries removed from the
+        cache by an earlier entry's processing are skipped.  Returns
+        the number of entries processed.
+        """
+        count = 0
+        for entry in MessageCacheEntry.queue_ready_prefix(self.__queue, now):
+            if entry.cache is self:
+                entry.process_timeout()
+                count += 1
+        return count
+
     def clear(self):
         """Remove all entries in the cache."""
         while self.__queue:
@@ -218,13 +345,14 @@ class MessageCache (object):
         self.__pending.remove(entry)
         entry.queue_insert(self.__queue)
 
-    def _reposition(self, entry):
+    def _reposition(self, entry, old_time_due=None):
         """Re-place *entry* at its correct location in the queue.
 
         This will be invoked whenever the underlying
         :attr:`coapy.util.TimeDueOrdinal.time_due` attribute value is
-        changed."""
-        entry.queue_reposition(self.__queue)
+        changed.  *old_time_due* is the value it had while queued, and
+        allows the entry to be located without scanning the queue."""
+        entry.queue_reposition(self.__queue, old_time_due)
 
     def __len__(self):
         return len(self.__queue)
@@ -268,8 +396,14 @@ class MessageCacheEntry (coapy.util.TimeDueOrdinal):
     If *activate* is ``False`` the entry is held
     :attr:`pending<MessageCache.pending>` until something assigns an
     initial :attr:`time_due`.
+
+    Instances hold their state in slots and have no ``__dict__``;
+    subclasses declare their own ``__slots__`` to keep that property.
     """
 
+    __slots__ = ('__cache', '__created_clk', '__activated_clk',
+                 '__expiry_offset', '__message', '__time_due')
+
     @property
     def cache(self):
         """The :class:`MessageCache` to which this entry belongs.
@@ -277,7 +411,6 @@ class MessageCacheEntry (coapy.util.TimeDueOrdinal):
         and cleared when it has been removed from its cache.
         """
         return self.__cache
-    __cache = None
 
     def _dissociate(self):
         """Remove the connection between the instance and the cache.
@@ -293,7 +426,6 @@ class MessageCacheEntry (coapy.util.TimeDueOrdinal):
         was created.  Distinguish this from :attr:`activated_clk`.
         """
         return self.__created_clk
-    __created_clk = None
 
     @property
     def activated_clk(self):
@@ -303,7 +435,6 @@ class MessageCacheEntry (coapy.util.TimeDueOrdinal):
         from :attr:`created_clk`.
         """
         return self.__activated_clk
-    __activated_clk = None
 
     @property
     def expires_clk(self):
@@ -322,13 +453,11 @@ class MessageCacheEntry (coapy.util.TimeDueOrdinal):
         if self.__activated_clk is not None:
             return self.__activated_clk + self.__expiry_offset
         return None
-    __expiry_offset = None
 
     @property
     def message(self):
         """The :class:`coapy.message.Message` being cached."""
         return self.__message
-    __message = None
 
     def _get_time_due(self):
         """See :attr:`coapy.util.TimeDueOrdinal.time_due`.  In this
@@ -359,8 +488,7 @@ class MessageCacheEntry (coapy.util.TimeDueOrdinal):
             if old_value is None:
                 self.__cache._activate(self)
             else:
-                self.__cache._reposition(self)
-    __time_due = None
+                self.__cache._reposition(self, old_value)
     time_due = property(_get_time_due, _set_time_due)
 
     @property
@@ -398,6 +526,9 @@ class MessageCacheEntry (coapy.util.TimeDueOrdinal):
             raise TypeError(cache)
         if not isinstance(message, coapy.message.Message):
             raise TypeError(message)
+        self.__cache = None
+        self.__activated_clk = None
+        self.__time_due = None
         super(MessageCacheEntry, self).__init__()
         if message.messageID is None:
             raise ValueError(message)
@@ -441,18 +572,17 @@ class SentMessageCacheEntry (MessageCacheEntry):
     ST_completed = 3
     ST_removed = 4
 
+    __slots__ = ('__state', '__transmissions', '__timeout', '__bebo',
+                 '__reply', '__destination_endpoint', '__stale_at')
+
     @property
     def state(self):
         return self.__state
-    __state = None
 
     @property
     def transmissions(self):
         """Number of times this message has been transmitted."""
         return self.__transmissions
-    __transmissions = None
-
-    __bebo = None
 
     @property
     def reply_message(self):
@@ -465,13 +595,11 @@ class SentMessageCacheEntry (MessageCacheEntry):
         received.
         """
         return self.__reply
-    __reply = None
 
     @property
     def destination_endpoint(self):
         """The endpoint to which the message is being sent."""
         return self.__destination_endpoint
-    __destination_endpoint = None
 
     @property
     def stale_at(self):
@@ -487,7 +615,6 @@ class SentMessageCacheEntry (MessageCacheEntry):
         The value is ``None`` if the message is not a response.
         """
         return self.__stale_at
-    __stale_at = None
 
     def __init__(self, cache, message, destination_endpoint):
         if not isinstance(message, coapy.message.Message):
@@ -496,6 +623,9 @@ class SentMessageCacheEntry (MessageCacheEntry):
         self.__state = self.ST_untransmitted
         self.__transmissions = 0
         self.__timeout = 0
+        self.__bebo = None
+        self.__reply = None
+        self.__stale_at = None
         super(SentMessageCacheEntry, self).__init__(cache, message,
                                                     activate=False,
                                                     time_due_offset=0)
@@ -565,6 +695,8 @@ class RcvdMessageCacheEntry (MessageCacheEntry):
     cache.
     """
 
+    __slots__ = ('__reception_count', '__reply_message')
+
     @property
     def reception_count(self):
         """The number of times a message with this entry's
@@ -574,7 +706,6 @@ class RcvdMessageCacheEntry (MessageCacheEntry):
         re-used prematurely.
         """
         return self.__reception_count
-    __reception_count = None
 
     @property
     def reply_message(self):
@@ -588,7 +719,6 @@ class RcvdMessageCacheEntry (MessageCacheEntry):
         non-confirmable message may have no response at all.
         """
         return self.__reply_message
-    __reply_message = None
 
     def reply(self, reset=False, message=None):
         """Create the :attr:`reply_message` for the reception in this entry.
@@ -640,6 +770,7 @@ class RcvdMessageCacheEntry (MessageCacheEntry):
         if not isinstance(message, coapy.message.Message):
             raise ValueError(message)
         self.__reception_count = 1
+        self.__reply_message = None
         super(RcvdMessageCacheEntry, self).__init__(cache, message, activate=True)
 
     def process_timeout(self):
@@ -699,7 +830,8 @@ class Endpoint (object):
     a given key comprising :attr:`family`, :attr:`ip_addr`,
     :attr:`port`, and :attr:`security_mode`.  Attempts to instantiate
     a new endpoint with parameters that match a previously-created one
-    will return a reference to the original instance.
+    will return a reference to the original instance for as long as
+    that instance remains referenced.
     """
 
     # NOTE To Developer: Because Endpoint controls object allocation
@@ -759,6 +891,10 @@ class Endpoint (object):
 
         When :attr:`family` is ``None`` this is the *name* in
         Net-Unicode format.
+
+        The value is the one used in the key that makes the endpoint
+        unique: the result of :func:`python:socket.inet_pton` (or of
+        :func:`coapy.util.to_net_unicode`), held as-is.
         """
         return self.__in_addr
 
@@ -786,9 +922,21 @@ class Endpoint (object):
         name, the resolved address of the host is used for
         :attr:`sockaddr` and for this property.
 
+        For IP endpoints the value is formatted from :attr:`in_addr`
+        when first used, so it is canonical regardless of how the
+        address was spelled when the endpoint was created.
+
         .. _section 3.2.2 of RFC3986: http://tools.ietf.org/html/rfc3986#section-3.2.2
         """
-        return self.__uri_host
+        uri_host = self.__uri_host
+        if uri_host is None:
+            if socket.AF_INET6 == self.__family:
+                uri_host = '[{0}]'.format(socket.inet_ntop(self.__family, self.__in_addr))
+            else:
+                uri_host = '{0}'.format(socket.inet_ntop(self.__family, self.__in_addr))
+            self.__uri_host = uri_host
+        return uri_host
+    __uri_host = None
 
     @property
     def base_uri(self):
@@ -796,11 +944,20 @@ class Endpoint (object):
 
         This is used by :meth:`uri_to_options` to avoid the need to
         specify the protocol and netloc when creating option lists.
+        It is also what :meth:`uri_from_options` returns for an empty
+        option list, and is computed once on first use.
         """
-        return self.__base_uri
+        base_uri = self.__base_uri
+        if base_uri is None:
+            (scheme, netloc) = self.__scheme_netloc
+            base_uri = self.__base_uri = scheme + '://' + netloc + '/'
+        return base_uri
     __base_uri = None
 
-    __EndpointRegistry = {}
+    # Map from the key produced by _key_for_sockaddr to the canonical
+    # instance.  Values are held weakly so endpoints that are no
+    # longer referenced do not accumulate over the life of a process.
+    __EndpointRegistry = weakref.WeakValueDictionary()
 
     @staticmethod
     def _key_for_sockaddr(sockaddr, family, security_mode=None):
@@ -844,7 +1001,8 @@ class Endpoint (object):
         within *family* (if required) will raise
         :exc:`python:socket.gaierror`.
         """
-        if sockaddr is not None:
+        # A key cannot be formed for AF_UNSPEC, so don't try.
+        if (sockaddr is not None) and (socket.AF_UNSPEC != family):
             try:
                 key = Endpoint._key_for_sockaddr(sockaddr, family, security_mode)
                 ep = Endpoint.__EndpointRegistry.get(key)
@@ -852,6 +1010,7 @@ class Endpoint (object):
                     return (ep.family, ep.sockaddr)
             except:
                 pass
+        if sockaddr is not None:
             if not isinstance(sockaddr, tuple):
                 raise TypeError(sockaddr)
             if 2 > len(sockaddr):
@@ -862,13 +1021,71 @@ class Endpoint (object):
         if not isinstance(port, int):
             raise TypeError(port)
         if family is None:
-            gai = (family, None, None, host, (host, port))
-        else:
-            gais = socket.getaddrinfo(host, port, family, socket.SOCK_DGRAM, 0,
-                                      (socket.AI_ADDRCONFIG | socket.AI_V4MAPPED
-                                       | socket.AI_NUMERICSERV))
-            gai = gais.pop(0)
-        return (gai[0], gai[4])
+            return (family, (host, port))
+        rkey = (host, port, family)
+        sockinfo = Endpoint.__SockinfoCache.get(rkey)
+        if sockinfo is None:
+            sockinfo = Endpoint.__numeric_sockinfo(host, port, family)
+            if sockinfo is None:
+                # Names are resolved every time so changes to their
+                # records are seen.
+                gais = socket.getaddrinfo(host, port, family, socket.SOCK_DGRAM, 0,
+                                          (socket.AI_ADDRCONFIG | socket.AI_V4MAPPED
+                                           | socket.AI_NUMERICSERV))
+                gai = gais.pop(0)
+                return (gai[0], gai[4])
+            if Endpoint.__SockinfoCacheLimit <= len(Endpoint.__SockinfoCache):
+                Endpoint.__SockinfoCache.clear()
+            Endpoint.__SockinfoCache[rkey] = sockinfo
+        return sockinfo
+
+    # Map from (host, port, family) to the (family, sockaddr) resolved
+    # by _canonical_sockinfo for IP literals and loopback names,
+    # discarded wholesale when it grows past __SockinfoCacheLimit
+    # entries.
+    __SockinfoCache = {}
+    __SockinfoCacheLimit = 256
+
+    # Map from (name, family) to the loopback literal that name
+    # resolves to.  RFC 6761 reserves "localhost" for the loopback
+    # address, and within AF_INET that can only be 127.0.0.1.  Other
+    # families depend on the resolver's address ordering and are left
+    # to getaddrinfo.
+    __LoopbackLiterals = {
+        ('localhost', socket.AF_INET): '127.0.0.1',
+    }
+
+    @staticmethod
+    def __numeric_sockinfo(host, port, family):
+        """Resolve an IP literal *host* without
+        :func:`python:socket.getaddrinfo`.
+
+        Returns ``(family, sockaddr)`` as :meth:`_canonical_sockinfo`
+        would, or ``None`` if *host* is not an IP literal in *family*.
+        The name ``localhost`` requested as
+        :data:`python:socket.AF_INET` is treated as ``127.0.0.1``.  An
+        IPv4 literal requested as :data:`python:socket.AF_INET6` is
+        left to :func:`python:socket.getaddrinfo`, which maps it.  Only
+        IPv6 literals contain a colon, so at most one conversion is
+        attempted.  A *host* that is not text is left to
+        :func:`python:socket.getaddrinfo`, which rejects it.
+        """
+        if not isinstance(host, (bytes, unicode)):
+            return None
+        try:
+            host = Endpoint.__LoopbackLiterals.get((host.lower(), family), host)
+            if ':' in host:
+                if family in (socket.AF_UNSPEC, socket.AF_INET6):
+                    in_addr = socket.inet_pton(socket.AF_INET6, host)
+                    return (socket.AF_INET6,
+                            (socket.inet_ntop(socket.AF_INET6, in_addr), port, 0, 0))
+            elif family in (socket.AF_UNSPEC, socket.AF_INET):
+                in_addr = socket.inet_pton(socket.AF_INET, host)
+                return (socket.AF_INET,
+                        (socket.inet_ntop(socket.AF_INET, in_addr), port))
+        except (socket.error, ValueError, TypeError):
+            pass
+        return None
 
     @classmethod
     def lookup_endpoint(cls, sockaddr=None, family=socket.AF_UNSPEC,
@@ -881,7 +1098,7 @@ class Endpoint (object):
         :class:`Endpoint` would result in creation of a new endpoint.
         """
         instance = None
-        if sockaddr is not None:
+        if (sockaddr is not None) and (socket.AF_UNSPEC != family):
             try:
                 key = Endpoint._key_for_sockaddr(sockaddr, family, security_mode)
                 instance = Endpoint.__EndpointRegistry.get(key)
@@ -898,7 +1115,7 @@ class Endpoint (object):
                 security_mode=None,
                 host=None, port=coapy.COAP_PORT):
         instance = None
-        if sockaddr is not None:
+        if (sockaddr is not None) and (socket.AF_UNSPEC != family):
             try:
                 key = Endpoint._key_for_sockaddr(sockaddr, family, security_mode)
                 instance = Endpoint.__EndpointRegistry.get(key)
@@ -919,20 +1136,10 @@ class Endpoint (object):
             instance.__port = port
             instance.__security_mode = security_mode
             instance.__sockaddr = sockaddr
-            if socket.AF_INET == family:
-                instance.__uri_host = '{0}'.format(socket.inet_ntop(instance.family,
-                                                                    instance.in_addr))
-            elif socket.AF_INET6 == family:
-                instance.__uri_host = '[{0}]'.format(socket.inet_ntop(instance.family,
-                                                                      instance.in_addr))
-            else:
+            if not (family in (socket.AF_INET, socket.AF_INET6)):
                 instance.__uri_host = host
         return instance
 
-    def __del__(self):
-        self._reset()
-        super(Endpoint, self).__del__(self)
-
     def _reset(self):
         """Return all data to its initial state.
 
@@ -955,9 +1162,10 @@ class Endpoint (object):
         # __new__.
         super(Endpoint, self).__init__()
         # Note: Only re-initialize if the instance was newly created.
-        if self.__base_uri is None:
-            self.__base_uri = self.uri_from_options([])
+        if not self.__initialized:
+            self.__initialized = True
             self._reset()
+    __initialized = False
 
     def get_peer_endpoint(self, sockaddr=None, host=None, port=coapy.COAP_PORT):
         """Find the endpoint at *sockaddr* that this endpoint can talk to.
@@ -998,10 +1206,40 @@ class Endpoint (object):
             pass
         return False
 
+    __SchemePorts = {'coap': coapy.COAP_PORT,
+                     'coaps': coapy.COAPS_PORT}
+
     @staticmethod
     def _port_for_scheme(scheme):
-        return {'coap': coapy.COAP_PORT,
-                'coaps': coapy.COAPS_PORT}[scheme]
+        return Endpoint.__SchemePorts[scheme]
+
+    @property
+    def __scheme_netloc(self):
+        # The URI scheme and authority for this endpoint absent any
+        # Uri-Host or Uri-Port option, computed on first use.
+        scheme_netloc = self.__scheme_netloc_cache
+        if scheme_netloc is None:
+            scheme = 'coap'
+            if self.security_mode is not None:
+                scheme = 'coaps'
+            netloc = self.uri_host
+            if self.port != self._port_for_scheme(scheme):
+                netloc = '{0}:{1}'.format(netloc, self.port)
+            scheme_netloc = self.__scheme_netloc_cache = (scheme, netloc)
+        return scheme_netloc
+    __scheme_netloc_cache = None
+
+    def uri_join(self, ref):
+        """Resolve the URI reference *ref* relative to :attr:`base_uri`.
+
+        The result is that of :func:`python:urlparse.urljoin` with
+        :attr:`base_uri` as the base.  An absolute-path reference
+        (*ref* begins with a single slash), the common case, is
+        appended to the scheme and authority without parsing either.
+        """
+        if ('/' == ref[:1]) and ('/' != ref[1:2]):
+            return self.base_uri[:-1] + ref
+        return urlparse.urljoin(self.base_uri, ref)
 
     def uri_to_options(self, uri, base_uri=None):
         """Convert a URI to a list of CoAP options relative to this endpoint.
@@ -1027,58 +1265,61 @@ class Endpoint (object):
           element.
         """
 
-        if base_uri is None:
-            base_uri = self.base_uri
-        if base_uri is not None:
-            uri = urlparse.urljoin(base_uri, uri)
-        res = urlparse.urlsplit(uri)
         opts = []
-        # 6.4.1. absolute-URI = scheme ":" hier-part [ "?" query ]
-        if (not res.scheme) \
-           or ((res.netloc is None) and (res.path is None)) \
-           or res.fragment:
-            raise URIError('not absolute', uri)
-        # 6.4.2. Make this user's job or done by urljoin
-        # 6.4.3. Check scheme
-        scheme = res.scheme.lower()
-        if not (scheme in ('coap', 'coaps')):
-            raise URIError('invalid scheme', res.scheme)
-        # 6.4.4. Unnecessary: fragments aren't allowed in absolute-URIs,
-        # or in the restrictions for coap-URI and coaps-URI.
-
-        # 6.4.5. authority = [ userinfo "@" ] host [ ":" port] CoAP
-        # doesn't provide a way to pass userinfo, so defer to the
-        # ParseResult hostname and port values rather than try to re-parse
-        # netloc locally.
-        if res.hostname:
-            host = coapy.util.url_unquote(res.hostname)
-            if not self.is_same_host(host):
-                opts.append(coapy.option.UriHost(host))
-
-        # 6.4.6.  Set port from URI or default from scheme
-        port = res.port
-        if port is None:
-            port = self._port_for_scheme(scheme)
-
-        # 6.4.7.
-        if port != self.port:
-            opts.append(coapy.option.UriPort(port))
+        prefix = self.base_uri
+        if (base_uri is None) and not uri.startswith(prefix):
+            uri = self.uri_join(uri)
+        if uri.startswith(prefix):
+            # Fast path: an absolute URI on this endpoint's own scheme,
+            # host, and default port needs neither resolution nor
+            # Uri-Host and Uri-Port options.  Keep the slash that
+            # terminates the prefix as the start of the path.
+            (path, query, fragment) = _split_path_query(uri[len(prefix) - 1:])
+            if fragment:
+                raise URIError(URIError.NOT_ABSOLUTE, uri)
+        else:
+            if base_uri is not None:
+                uri = urlparse.urljoin(base_uri, uri)
+            (scheme, host, port, path, query, fragment) = _split_coap_uri(uri)
+            # 6.4.1. absolute-URI = scheme ":" hier-part [ "?" query ]
+            if (not scheme) or fragment:
+                raise URIError(URIError.NOT_ABSOLUTE, uri)
+            # 6.4.2. Make this user's job or done by urljoin
+            # 6.4.3. Check scheme
+            if not (scheme in ('coap', 'coaps')):
+                raise URIError(URIError.INVALID_SCHEME, scheme)
+            # 6.4.4. Unnecessary: fragments aren't allowed in
+            # absolute-URIs, or in the restrictions for coap-URI and
+            # coaps-URI.
+
+            # 6.4.5. authority = [ userinfo "@" ] host [ ":" port]
+            # CoAP doesn't provide a way to pass userinfo, so
+            # _split_coap_uri discards it.
+            if host:
+                host = coapy.util.url_unquote(host)
+                if not self.is_same_host(host):
+                    opts.append(coapy.option.UriHost(host))
+
+            # 6.4.6.  Set port from URI or default from scheme
+            if port is None:
+                port = self._port_for_scheme(scheme)
+
+            # 6.4.7.
+            if port != self.port:
+                opts.append(coapy.option.UriPort(port))
 
         # 6.4.8
-        path = res.path
+        url_unquote = coapy.util.url_unquote
         if path and not ('/' == path):
             if path.startswith('/'):
                 path = path[1:]
-            for segment in path.split('/'):
-                segment = coapy.util.url_unquote(segment)
-                opts.append(coapy.option.UriPath(segment))
+            UriPath = coapy.option.UriPath
+            opts.extend([UriPath(url_unquote(_s)) for _s in path.split('/')])
 
         # 6.4.9
-        query = res.query
         if query:
-            for qseg in query.split('&'):
-                qseg = coapy.util.url_unquote(qseg)
-                opts.append(coapy.option.UriQuery(qseg))
+            UriQuery = coapy.option.UriQuery
+            opts.extend([UriQuery(url_unquote(_s)) for _s in query.split('&')])
         return opts
 
     def uri_from_options(self, opts):
@@ -1097,47 +1338,39 @@ class Endpoint (object):
         :class:`UriPath<coapy.option.UriPath>` and
         :class:`UriQuery<coapy.option.UriQuery>` options in *opts*.
         """
-        scheme = 'coap'
-        if self.security_mode is not None:
-            scheme = 'coaps'
-        host = None
-        opt = coapy.option.UriHost.first_match(opts)
-        if opt is not None:
-            host = opt.value
-            if host is None:
-                raise URIError('empty Uri-Host')
-            if host and ('[' != host[0]):
-                host = coapy.util.url_quote(host)
-        if host is None:
+        if not opts:
+            return self.base_uri
+        option = coapy.option
+        url_quote = coapy.util.url_quote
+        host_opt = option.UriHost.first_match(opts)
+        port_opt = option.UriPort.first_match(opts)
+        (scheme, netloc) = self.__scheme_netloc
+        if (host_opt is not None) or (port_opt is not None):
             host = self.uri_host
-        port = self.port
-        opt = coapy.option.UriPort.first_match(opts)
-        if opt is not None:
-            port = opt.value
-            if port is None:
-                raise URIError('empty Uri-Port')
-        if port == self._port_for_scheme(scheme):
-            netloc = host
-        else:
-            netloc = '{0}:{1}'.format(host, port)
-        # Paths are always absolute, so start with an empty segment so the
-        # encoded version begins with a slash.
-        elts = ['']
-        for segment_opt in coapy.option.UriPath.all_match(opts):
-            segment = segment_opt.value
-            segment = coapy.util.url_quote(segment, '')
-            elts.append(segment)
-        path = '/'.join(elts)
-        if not path:
-            # Make sure we still have the leading slash
-            path = '/'
-        elts = []
-        for qseg_opt in coapy.option.UriQuery.all_match(opts):
-            qseg = qseg_opt.value
-            qseg = coapy.util.url_quote(qseg, '?')
-            elts.append(qseg)
-        query = '&'.join(elts)
-        return urlparse.urlunsplit((scheme, netloc, path, query, None))
+            if host_opt is not None:
+                host = host_opt.value
+                if host is None:
+                    raise URIError(URIError.EMPTY_URI_HOST)
+                if host and ('[' != host[0]):
+                    host = url_quote(host)
+            port = self.port
+            if port_opt is not None:
+                port = port_opt.value
+                if port is None:
+                    raise URIError(URIError.EMPTY_URI_PORT)
+            if port == self._port_for_scheme(scheme):
+                netloc = host
+            else:
+                netloc = '{0}:{1}'.format(host, port)
+        # Paths are always absolute, so the encoded version begins with
+        # a slash even when there are no segments.
+        path = '/' + '/'.join([url_quote(_o.value, '')
+                               for _o in option.UriPath.all_match(opts)])
+        query = '&'.join([url_quote(_o.value, '?')
+                          for _o in option.UriQuery.all_match(opts)])
+        if query:
+            return scheme + '://' + netloc + path + '?' + query
+        return scheme + '://' + netloc + path
 
     def finalize_message(self, message):
         """Final checks and refinements for *message* relative to this
@@ -1209,8 +1442,14 @@ class Endpoint (object):
         return m
 
     def __unicode__(self):
-        return '{s.uri_host}:{s.port:d}'.format(s=self)
+        # The identifying attributes never change, so neither does the
+        # text.
+        text = self.__text
+        if text is None:
+            text = self.__text = '{s.uri_host}:{s.port:d}'.format(s=self)
+        return text
     __str__ = __unicode__
+    __text = None
 
 
 class RemoteEndpointState(object):
@@ -1304,7 +1543,9 @@ class LocalEndpoint(Endpoint):
 
     def _reset_next_messageID(self, start):
         # Back-door for unit testing from known starting point
-        self.__messageID_iter = itertools.imap(lambda _v: _v % 65536, itertools.count(start))
+        # Message IDs are 16 bits; masking with a bound int method
+        # wraps the count without a Python-level call per ID.
+        self.__messageID_iter = itertools.imap((0xFFFF).__and__, itertools.count(start))
 
     # A map from Endpoint instances to RemoteEndpointState instances.
     __remote_state = None
@@ -33,9 +33,8 @@ from __future__ import division
 import logging
 _log = logging.getLogger(__name__)
 
-import sys
-import urllib
 import BaseHTTPServer
+import SocketServer
 import socket
 import urlparse
 import time
@@ -47,6 +46,12 @@ class HTTPServer(BaseHTTPServer.HTTPServer):
     interface we want.
     """
 
+    request_queue_size = 1024
+    """The listen backlog for the server socket.  The
+    :class:`python:SocketServer.TCPServer` default of 5 causes
+    connection attempts to be refused under bursts of clients; the
+    kernel may further limit the effective value."""
+
     def make_uri(self, path, query='', fragment=''):
         """Create an absolute URI for something hosted on this server.
 
@@ -67,6 +72,18 @@ class HTTPServer(BaseHTTPServer.HTTPServer):
         return urlparse.urlunsplit(('http', netloc, path, query, fragment))
 
 
+class ThreadingHTTPServer(SocketServer.ThreadingMixIn, HTTPServer):
+    """A :class:`HTTPServer` that handles each request in its own
+    thread, so a slow client does not delay others.
+
+    Worker threads are daemonic and do not prevent process exit.
+    Resources registered with a handler used by this server must
+    protect any state they modify across requests.
+    """
+
+    daemon_threads = True
+
+
 class HTTPRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
     """Modifications required to provide the server development
     interface we want.
@@ -83,6 +100,13 @@ class HTTPRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
     request URI ``path``.
     """
 
+    wbufsize = -1
+    """Buffer responses so the status line, headers, and body written
+    by a resource leave in as few segments as possible; the buffer is
+    flushed when each request completes.  (The
+    :class:`python:SocketServer.StreamRequestHandler` default of 0
+    sends each header line with a separate system call.)"""
+
     split_uri = None
     """The results of invoking :func:`python:urlparse.urlsplit` on
     :attr:`path<python:BaseHTTPServer.BaseHTTPRequestHandler.path>`.
@@ -93,6 +117,32 @@ class HTTPRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
     :class:`HTTPResource`.
     """
 
+    # Map from integral POSIX times to their HTTP-date strings, shared
+    # by all handlers and discarded wholesale when it grows past
+    # __HTTPDateLimit entries.
+    __HTTPDates = {}
+    __HTTPDateLimit = 64
+
+    def date_time_string(self, timestamp=None):
+        """Return *timestamp* (default now) formatted as an HTTP-date.
+
+        HTTP-dates have a resolution of one second, so the string for
+        each second is computed once by
+        :meth:`python:BaseHTTPServer.BaseHTTPRequestHandler.date_time_string`
+        and reused.
+        """
+        if timestamp is None:
+            timestamp = time.time()
+        timestamp = int(timestamp)
+        dates = HTTPRequestHandler.__HTTPDates
+        text = dates.get(timestamp)
+        if text is None:
+            text = BaseHTTPServer.BaseHTTPRequestHandler.date_time_string(self, timestamp)
+            if HTTPRequestHandler.__HTTPDateLimit <= len(dates):
+                dates.clear()
+            dates[timestamp] = text
+        return text
+
     @classmethod
     def add_resource(cls, resource):
         """Add *resource* to the registry for this class at
@@ -161,6 +211,7 @@ class HTTPRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
                 self.request_version = ''
                 self.command = ''
                 self.send_error(414)
+                self.wfile.flush()  # Added: output is buffered (wbufsize)
                 return
             if not self.raw_requestline:
                 self.close_connection = 1
@@ -173,8 +224,8 @@ class HTTPRequestHandler(BaseHTTPServer.BaseHTTPRequestHandler):
             resource = self.lookup_resource(self.split_uri.path)
             if resource is None:
                 self.send_error(404)
-                return
-            resource.handle_request(self)
+            else:
+                resource.handle_request(self)
             # <<< Modifications end here
             self.wfile.flush()  # actually send the response if not already done.
         except socket.timeout, e:
@@ -232,7 +283,6 @@ class HTTPResource(object):
         implemented, a 501 Unsupported Method error is returned to the
         client.
         """
-        self.request = request
         mname = 'do_' + request.command
         meth = getattr(self, mname, None)
         if meth is None:
@@ -34,6 +34,11 @@ import coapy.option
 import coapy.util
 
 
+# Precompiled packer for the fixed message header: version, type and
+# token length; code; message ID.
+_pack_header = struct.Struct(str('!BBH')).pack
+
+
 class MessageError (coapy.CoAPyException):
     pass
 
@@ -568,7 +573,7 @@ class Message(object):
         vttkl = (1 << 6) | (self.__type << 4)
         vttkl |= 0x0F & len(self.__token)
         elements = []
-        elements.append(struct.pack(str('!BBH'), vttkl, self.packed_code, self.messageID))
+        elements.append(_pack_header(vttkl, self.packed_code, self.messageID))
         elements.append(self.__token)
         if self.options:
             elements.append(coapy.option.encode_options(self.options))
@@ -603,29 +608,28 @@ class Message(object):
 
         if not isinstance(packed_message, bytes):
             raise TypeError(packed_message)
-        data = bytearray(packed_message)
-        vttkl = data.pop(0)
+        # Only the fixed header is needed as integers; everything
+        # after it is sliced directly from packed_message.
+        data = bytearray(packed_message[:4])
+        vttkl = data[0]
         ver = (vttkl >> 6)
         if ver != cls.Ver:
             # 3: Unknown version number: silently ignore
             return None
         message_type = 0x03 & (vttkl >> 4)
         tkl = 0x0F & vttkl
-        code = cls.code_as_tuple(data.pop(0))
-        message_id = data.pop(0)
-        message_id = (message_id << 8) | data.pop(0)
+        code = cls.code_as_tuple(data[1])
+        message_id = (data[2] << 8) | data[3]
         dkw = {'type': message_type,
                'code': code,
                'messageID': message_id}
         if 9 <= tkl:
             raise MessageFormatError(MessageFormatError.TOKEN_TOO_LONG, dkw)
-        if ((cls.Empty == code) and ((0 != tkl) or (0 < len(data)))):
+        if ((cls.Empty == code) and ((0 != tkl) or (4 < len(packed_message)))):
             raise MessageFormatError(MessageFormatError.EMPTY_MESSAGE_NOT_EMPTY, dkw)
-        token = bytes(data[:tkl])
-        if 0 < tkl:
-            data[:tkl] = b''
+        token = packed_message[4:4 + tkl]
         try:
-            (options, remainder) = coapy.option.decode_options(bytes(data))
+            (options, remainder) = coapy.option.decode_options(packed_message[4 + tkl:])
         except coapy.option.OptionDecodeError as e:
             # This can be an invalid delta or length in the first byte,
             # or a value field that does not conform to the requirements.
@@ -633,8 +637,7 @@ class Message(object):
             raise MessageFormatError(MessageFormatError.INVALID_OPTION, dkw)
         payload = None
         if 0 < len(remainder):
-            data = bytearray(remainder)
-            if 0xFF != data[0]:
+            if b'\xFF' != remainder[:1]:
                 # This should have been interpreted as an option decode error
                 raise MessageFormatError(MessageFormatError.INVALID_OPTION, dkw)
             payload = remainder[1:]
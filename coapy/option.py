@@ -34,9 +34,17 @@ _log = logging.getLogger(__name__)
 
 import coapy
 import struct
+import operator
+import binascii
 import unicodedata
 import coapy.util
 
+# The text type, bound once so the name also resolves without 2to3.
+try:
+    _text = unicode
+except NameError:
+    _text = str
+
 
 class OptionError (coapy.InfrastructureError):
     pass
@@ -92,6 +100,18 @@ class InvalidMultipleOptionError (InvalidOptionError):
     pass
 
 
+# Precompiled packers used by format_uint.
+_pack_uint8 = struct.Struct(str('!B')).pack
+_pack_uint16 = struct.Struct(str('!H')).pack
+_pack_uint32 = struct.Struct(str('!I')).pack
+_pack_uint64 = struct.Struct(str('!Q')).pack
+
+# Narrowest packer accommodating a format_uint of the keyed
+# max_length, used for the widths that fit a struct integer.
+_uint_packers = {1: _pack_uint8, 2: _pack_uint16, 3: _pack_uint32,
+                 4: _pack_uint32}
+
+
 class _format_base (object):
     """Abstract base for typed option value formatters.
 
@@ -106,29 +126,18 @@ class _format_base (object):
 
     *max_length* is the maximum length of the packed representation in
     octets.  *min_length* is the minimum length of the packed
-    representation in octets.
+    representation in octets.  Both are available as attributes of
+    the same name, along with :attr:`unpacked_type` which is the
+    Python type used for unpacked values.  These attributes are set
+    at construction and should be treated as read-only.
     """
-    def _min_length(self):
-        """The minimum acceptable length of the packed representation,
-        in octets.  This is a read-only property."""
-        return self.__min_length
-    min_length = property(_min_length)
-
-    def _max_length(self):
-        """The maximum acceptable length of the packed representation,
-        in octets.  This is a read-only property."""
-        return self.__max_length
-    max_length = property(_max_length)
-
-    def _unpacked_type(self):
-        """The Python type used for unpacked values.  This is a
-        read-only property."""
-        return self._UnpackedType
-    unpacked_type = property(_unpacked_type)
+
+    __slots__ = ('min_length', 'max_length', 'unpacked_type')
 
     def __init__(self, max_length, min_length):
-        self.__max_length = max_length
-        self.__min_length = min_length
+        self.max_length = max_length
+        self.min_length = min_length
+        self.unpacked_type = self._UnpackedType
 
     def to_packed(self, value):
         """Convert *value* to packed form.
@@ -150,6 +159,15 @@ class _format_base (object):
             raise OptionLengthError(value)
         return pv
 
+    def normalize(self, value):
+        """Return the canonical unpacked form of *value*.
+
+        This is equivalent to ``self.from_packed(self.to_packed(value))``
+        and raises the same exceptions as :meth:`to_packed`.
+        Subclasses override it where the round trip can be avoided.
+        """
+        return self._from_packed(self.to_packed(value))
+
     def _to_packed(self, value):
         """'Virtual' method implemented by subclasses to do
         type-specific packing.  The subclass implementation may assume
@@ -216,11 +234,16 @@ class format_empty (_format_base):
     both the packed and unpacked value.
     """
 
+    __slots__ = ()
+
     _UnpackedType = bytes
 
     def __init__(self):
         super(format_empty, self).__init__(0, 0)
 
+    def normalize(self, value):
+        return self.to_packed(value)
+
     def _to_packed(self, value):
         return value
 
@@ -238,11 +261,16 @@ class format_opaque (_format_base):
     unpacking is an identity operation.
     """
 
+    __slots__ = ()
+
     _UnpackedType = bytes
 
     def __init__(self, max_length, min_length=0):
         super(format_opaque, self).__init__(max_length, min_length)
 
+    def normalize(self, value):
+        return self.to_packed(value)
+
     def _to_packed(self, value):
         return value
 
@@ -268,26 +296,33 @@ class format_uint (_format_base):
     validation against :attr:`max_length`.
     """
 
+    __slots__ = ('_limit', '_pack')
+
     _UnpackedType = int
 
     def __init__(self, max_length):
         super(format_uint, self).__init__(max_length, 0)
+        # Bound on encodable values, and the fixed-width packer used
+        # before stripping leading zeros, both fixed by max_length.
+        self._limit = 1 << (8 * max_length)
+        self._pack = _uint_packers.get(max_length, _pack_uint64)
+
+    def normalize(self, value):
+        if not isinstance(value, int):
+            raise TypeError(value)
+        if (0 > value) or (self._limit <= value):
+            raise OptionLengthError(value)
+        return int(value)
 
     def _to_packed(self, value):
-        if 0 == value:
-            return b''
-        pv = bytearray(struct.pack(str('!Q'), value))
-        for i in xrange(len(pv)):
-            if pv[i] != 0:
-                break
-        return bytes(pv[i:])
+        if self._limit <= value:
+            raise OptionLengthError(value)
+        return self._pack(value).lstrip(b'\x00')
 
     def _from_packed(self, data):
-        value = 0
-        data = bytearray(data)
-        for i in xrange(len(data)):
-            value = (value * 256) + data[i]
-        return value
+        if not data:
+            return 0
+        return int(binascii.hexlify(data), 16)
 
     def option_encoding(self, value):
         if not isinstance(value, int):
@@ -295,19 +330,13 @@ class format_uint (_format_base):
         if (0 > value):
             raise ValueError(value)
         if value < 13:
-            ov = value
-            ovx = b''
-        elif value < 269:
-            ov = 13
-            ovx = self.to_packed(value - 13)
-            while len(ovx) < 1:
-                ovx = b'\x00' + ovx
-        else:
-            ov = 14
-            ovx = self.to_packed(value - 269)
-            while len(ovx) < 2:
-                ovx = b'\x00' + ovx
-        return (ov, ovx)
+            return (value, b'')
+        if value < 269:
+            return (13, _pack_uint8(value - 13))
+        value -= 269
+        if 65535 < value:
+            raise OptionLengthError(value)
+        return (14, _pack_uint16(value))
 
     def option_decoding(self, ov, data):
         if 15 <= ov:
@@ -333,17 +362,32 @@ class format_string (_format_base):
     unpacked representation.
     """
 
-    _UnpackedType = unicode
+    __slots__ = ()
+
+    _UnpackedType = _text
 
     def __init__(self, max_length, min_length=0):
         super(format_string, self).__init__(max_length, min_length)
 
+    def normalize(self, value):
+        if not isinstance(value, _text):
+            raise TypeError(value)
+        try:
+            pv = value.encode('ascii')
+        except UnicodeEncodeError:
+            return self._from_packed(self.to_packed(value))
+        if (len(pv) < self.min_length) or (self.max_length < len(pv)):
+            raise OptionLengthError(value)
+        return value
+
     def _to_packed(self, value):
         return coapy.util.to_net_unicode(value)
 
     def _from_packed(self, value):
-        rv = value.decode('utf-8')
-        return rv
+        try:
+            return value.decode('ascii')
+        except UnicodeDecodeError:
+            return value.decode('utf-8')
 
     def _to_text(self, value):
         return value
@@ -358,7 +402,7 @@ def _register_option(option_class):
         raise InvalidOptionTypeError(option_class)
     if not isinstance(option_class.number, int):
         raise InvalidOptionTypeError(option_class)
-    if not isinstance(option_class.name, unicode):
+    if not isinstance(option_class.name, _text):
         raise InvalidOptionTypeError(option_class)
     if not ((0 <= option_class.number) and (option_class.number <= 65535)):
         raise InvalidOptionTypeError(option_class)
@@ -390,6 +434,11 @@ def find_option(number):
     return _OptionRegistry.get(number, None)
 
 
+# Unvalidated form of find_option() for trusted internal callers that
+# already hold a non-negative int.
+_find_option_fast = _OptionRegistry.get
+
+
 def all_options():
     """Return an iterable producing all registered options."""
     return _OptionRegistry.values()
@@ -404,14 +453,16 @@ def all_options():
 # * It verifies that the values of these attributes are consistent with
 #   the specification;
 #
-# * It rewrites the subclass so that those attributes are read-only in
-#   both class and instance forms;
+# * It keeps those attributes read-only in both class and instance
+#   forms: class-level assignment is rejected by the metaclass, and
+#   option subclasses are given empty __slots__ (unless they declare
+#   their own) so instances have no __dict__ in which to shadow them;
 #
 # * It registers each option class so that it can be looked up by
 #   number.
 #
-# The concepts in this approach derive from:
-# http://stackoverflow.com/questions/1735434/class-level-read-only-properties-in-python
+# Leaving the values as plain class attributes means reading them is a
+# simple attribute lookup rather than a property call.
 #
 # Note that coapy.util.ReadOnlyMeta does something similar but only to
 # the class in which the attribute is introduced, while this works only
@@ -423,41 +474,58 @@ class _MetaUrOption(type):
     # reference to it.
     __UrOption = None
 
-    # The set of attributes in types that are to be made immutable if
-    # the type provides a non-None value for the attribute.
-    __ReadOnlyAttrs = ('number', '_repeatable', 'format', 'name')
+    # The set of attributes in types that are immutable once the type
+    # provides a non-None value for the attribute.
+    __ReadOnlyAttrs = frozenset(('number', '_repeatable', 'format', 'name'))
 
     @classmethod
     def SetUrOption(cls, ur_option):
         cls.__UrOption = ur_option
 
     def __new__(cls, name, bases, namespace):
-        # Provide a unique type that can hold the immutable class
-        # number and format values.
-        class UniqueUrOption (cls):
-            pass
-
         do_register = (cls.__UrOption is not None) and namespace.get('_RegisterOption', True)
 
-        # Only subclasses of UrOption have read-only attributes.  Make
-        # those attributes immutable at both the class and instance
-        # levels.
+        # Only subclasses of UrOption have read-only attributes.
+        # Without an instance __dict__ an assignment to one of them
+        # raises AttributeError.
         if (cls.__UrOption is not None):
-            for n in cls.__ReadOnlyAttrs:
-                v = namespace.get(n, None)
-                if (v is not None) and not isinstance(v, property):
-                    mp = property(lambda self_or_cls, _v=v: _v)
-                    namespace[n] = mp
-                    setattr(UniqueUrOption, n, mp)
+            namespace.setdefault('__slots__', ())
+
+        # Values derived from the class definition are placed in the
+        # namespace so the type is complete when created; subclasses
+        # that do not redefine the source attribute inherit them.
+
+        # Keep an unchecked copy of the option number for hot loops,
+        # and resolve the properties encoded in its bits.
+        number = namespace.get('number')
+        if isinstance(number, int):
+            namespace['_num'] = number
+            namespace['_is_critical'] = bool(is_critical_option(number))
+            namespace['_is_unsafe'] = bool(is_unsafe_option(number))
+            namespace['_is_no_cache_key'] = is_no_cache_key_option(number)
+
+        # Cardinality constraints are invariant for the class, so
+        # resolve them once here rather than on each validity check.
+        repeatable = namespace.get('_repeatable')
+        if isinstance(repeatable, tuple):
+            (req, resp) = repeatable
+            namespace['_ok_req'] = req is not None
+            namespace['_multi_req'] = req is True
+            namespace['_ok_resp'] = resp is not None
+            namespace['_multi_resp'] = resp is True
 
         # Create the subclass type, and register it if it's complete
         # (and not UrOption).
-        mcls = type.__new__(UniqueUrOption, name, bases, namespace)
+        mcls = type.__new__(cls, name, bases, namespace)
         if do_register:
             _register_option(mcls)
-
         return mcls
 
+    def __setattr__(cls, name, value):
+        if (name in _MetaUrOption.__ReadOnlyAttrs) and (getattr(cls, name, None) is not None):
+            raise AttributeError(name)
+        super(_MetaUrOption, cls).__setattr__(name, value)
+
 
 def is_critical_option(number):
     """Return ``True`` iff *number* identifies a critical option.
@@ -498,10 +566,15 @@ class UrOption (object):
     :attr:`value` will be initialized with the corresponding unpacked
     value; otherwise :attr:`value` will be ``None`` until a valid
     value is assigned.
+
+    Instances do not have a ``__dict__``: a subclass that needs
+    additional instance attributes must name them in ``__slots__``.
     """
 
     __metaclass__ = _MetaUrOption
 
+    __slots__ = ('__value', '_pkd')
+
     number = None
     """The option number.
 
@@ -547,44 +620,67 @@ class UrOption (object):
     """
 
     def is_critical(self):
-        """Passes ``self.number`` to :func:`is_critical_option`."""
-        return is_critical_option(self.number)
+        """Return ``True`` iff :func:`is_critical_option` is true for
+        ``self.number``."""
+        return self._is_critical
 
     def is_unsafe(self):
-        """Passes ``self.number`` to :func:`is_unsafe_option`."""
-        return is_unsafe_option(self.number)
+        """Return ``True`` iff :func:`is_unsafe_option` is true for
+        ``self.number``."""
+        return self._is_unsafe
 
     def is_no_cache_key(self):
-        """Passes ``self.number`` to :func:`is_no_cache_key_option`."""
-        return is_no_cache_key_option(self.number)
+        """Return ``True`` iff :func:`is_no_cache_key_option` is true for
+        ``self.number``."""
+        return self._is_no_cache_key
+
+    # Unchecked copy of number, and the flags derived from it,
+    # installed by _MetaUrOption.
+    _num = None
+    _is_critical = False
+    _is_unsafe = False
+    _is_no_cache_key = False
+
+    # _pkd holds the cached packed_value, or None if it must be
+    # recomputed.
+
+    # Booleans derived from _repeatable by _MetaUrOption when the
+    # subclass is defined.
+    _ok_req = False
+    _multi_req = False
+    _ok_resp = False
+    _multi_resp = False
 
     def valid_in_request(self):
         """Return ``True`` iff this option may appear at least once in a request message."""
-        return self._repeatable[0] is not None
+        return self._ok_req
 
     def valid_multiple_in_request(self):
         """Return ``True`` iff this option may appear multiple times in a request message."""
-        return self._repeatable[0] is True
+        return self._multi_req
 
     def valid_in_response(self):
         """Return ``True`` iff this option may appear at least once in a response message."""
-        return self._repeatable[1] is not None
+        return self._ok_resp
 
     def valid_multiple_in_response(self):
         """Return ``True`` iff this option may appear multiple times in a response message."""
-        return self._repeatable[1] is True
+        return self._multi_resp
 
     def __init__(self, unpacked_value=None, packed_value=None):
         super(UrOption, self).__init__()
+        self._pkd = None
         if unpacked_value is not None:
-            self._set_value(unpacked_value)
+            # As _set_value, without clearing _pkd a second time.
+            self.__value = self.format.normalize(unpacked_value)
         elif packed_value is not None:
             self.__value = self.format.from_packed(packed_value)
         else:
             self.__value = None
 
     def _set_value(self, unpacked_value):
-        self.__value = self.format.from_packed(self.format.to_packed(unpacked_value))
+        self.__value = self.format.normalize(unpacked_value)
+        self._pkd = None
 
     def _get_value(self):
         """Contains the value of the option.  This is an instance of
@@ -608,10 +704,7 @@ class UrOption (object):
         the class; an instance of :class:`UnrecognizedOption` will not
         be returned just because the :attr:`number` matches.
         """
-        for o in options:
-            if isinstance(o, cls):
-                return o
-        return None
+        return next((o for o in options if isinstance(o, cls)), None)
 
     @classmethod
     def all_match(cls, options):
@@ -622,16 +715,15 @@ class UrOption (object):
         an instance of :class:`UnrecognizedOption` will not be
         returned just because the :attr:`number` matches.
         """
-        rv = []
-        for o in options:
-            if isinstance(o, cls):
-                rv.append(o)
-        return rv
+        return [o for o in options if isinstance(o, cls)]
 
     @property
     def packed_value(self):
         """The :attr:`value` of the option in its packed representation."""
-        return self.format.to_packed(self.value)
+        pv = self._pkd
+        if pv is None:
+            pv = self._pkd = self.format.to_packed(self.__value)
+        return pv
 
     def __unicode__(self):
         if isinstance(self.format, format_empty):
@@ -651,6 +743,14 @@ _MetaUrOption.SetUrOption(UrOption)
 # bytes of offset.
 _optionint_helper = format_uint(2)
 
+# Sort keys for options and (number, packed_value) pairs.
+_number_key = operator.attrgetter('_num')
+_pair_key = operator.itemgetter(0)
+
+# Extract the (valid, valid_multiple) flags for requests and responses.
+_request_constraints = operator.attrgetter('_ok_req', '_multi_req')
+_response_constraints = operator.attrgetter('_ok_resp', '_multi_resp')
+
 
 def sorted_options(options):
     """Sort a sequence of options into canonical order.
@@ -660,7 +760,7 @@ def sorted_options(options):
     options with the same number remain in their original order.  This
     operation is used for duplicate detection and to calculate the
     delta required to encode options."""
-    return sorted(options, key=lambda _o: _o.number)
+    return sorted(options, key=_number_key)
 
 
 def replace_unacceptable_options(options, is_request):
@@ -687,22 +787,23 @@ def replace_unacceptable_options(options, is_request):
     resulting list of options is returned.
     """
     newopts = []
+    append = newopts.append
     if is_request:
-        valid = lambda _o: _o.valid_in_request()
-        valid_multiple = lambda _o: _o.valid_multiple_in_request()
+        constraints = _request_constraints
     else:
-        valid = lambda _o: _o.valid_in_response()
-        valid_multiple = lambda _o: _o.valid_multiple_in_response()
+        constraints = _response_constraints
     last_number = 0
     for opt in sorted_options(options):
-        delta = opt.number - last_number
-        last_number = opt.number
-        if not valid(opt):
-            newopts.append(UnrecognizedOption.from_option(opt))
-        elif (0 == delta) and not valid_multiple(opt):
-            newopts.append(UnrecognizedOption.from_option(opt))
+        number = opt._num
+        delta = number - last_number
+        last_number = number
+        (valid, valid_multiple) = constraints(opt)
+        if not valid:
+            append(UnrecognizedOption.from_option(opt))
+        elif (0 == delta) and not valid_multiple:
+            append(UnrecognizedOption.from_option(opt))
         else:
-            newopts.append(opt)
+            append(opt)
     return newopts
 
 
@@ -714,31 +815,89 @@ def encode_options(options):
     It may raise an exception if an option's value cannot be encoded,
     but performs no semantic
     validation."""
+    option_encoding = _optionint_helper.option_encoding
+    # Resolve each option's number and packed value once, then sort
+    # the pairs; the sort is stable as in sorted_options().
+    pairs = [(opt._num, opt.packed_value) for opt in options]
+    pairs.sort(key=_pair_key)
     last_number = 0
-    packed = []
-    for opt in sorted_options(options):
-        delta = opt.number - last_number
-        last_number = opt.number
-        pvalue = opt.packed_value
-        (od, odx) = _optionint_helper.option_encoding(delta)
-        (ol, olx) = _optionint_helper.option_encoding(len(pvalue))
-        encoded = struct.pack(str('B'), (od << 4) | ol)
-        encoded += odx + olx + pvalue
-        packed.append(encoded)
-    return b''.join(packed)
-
-
-def _decode_one_option(data):
-    if 0xFF == data[0]:
-        return (None, None, data)
-    odl = data.pop(0)
-    od = (odl >> 4)
-    ol = (odl & 0x0F)
-    if (15 == od) or (15 == ol):
-        raise OptionDecodeError(odl, bytes(data))
-    (delta, data) = _optionint_helper.option_decoding(od, data)
-    (length, data) = _optionint_helper.option_decoding(ol, data)
-    return (delta, length, data)
+    packed = bytearray()
+    for (number, pvalue) in pairs:
+        delta = number - last_number
+        last_number = number
+        (od, odx) = option_encoding(delta)
+        (ol, olx) = option_encoding(len(pvalue))
+        packed.append((od << 4) | ol)
+        packed += odx
+        packed += olx
+        packed += pvalue
+    return bytes(packed)
+
+
+def _scan_extended(data, idx, ov):
+    # Expand a 13/14 option delta or length nibble using the extension
+    # bytes at data[idx:].  Returns the value and the advanced cursor.
+    # _scan_options handles complete extensions inline; this also
+    # covers extensions truncated by the end of the data.
+    if 13 == ov:
+        (value, width) = (13, 1)
+    else:
+        (value, width) = (269, 2)
+    ext = 0
+    for b in data[idx:idx + width]:
+        ext = (ext << 8) | b
+    return (value + ext, idx + width)
+
+
+def _scan_options(data):
+    """Locate the options encoded at the start of *data*.
+
+    *data* must be a :class:`bytearray`.  The scan walks the buffer
+    with a cursor rather than consuming it, and returns ``(entries,
+    end)`` where *entries* is a list of ``(option_number, offset,
+    length)`` tuples identifying each packed option value within
+    *data*, and *end* is the offset of the first byte that is not part
+    of an option (normally the payload marker).
+
+    :exc:`OptionDecodeError` is raised if a delta or length nibble
+    uses the reserved value 15.
+    """
+    entries = []
+    append = entries.append
+    option_number = 0
+    idx = 0
+    end = len(data)
+    while idx < end:
+        odl = data[idx]
+        if 0xFF == odl:
+            break
+        idx += 1
+        delta = odl >> 4
+        length = odl & 0x0F
+        if (15 == delta) or (15 == length):
+            raise OptionDecodeError(odl, bytes(data[idx:]))
+        if 13 <= delta:
+            if (13 == delta) and (idx < end):
+                delta = 13 + data[idx]
+                idx += 1
+            elif (14 == delta) and (idx + 1 < end):
+                delta = 269 + ((data[idx] << 8) | data[idx + 1])
+                idx += 2
+            else:
+                (delta, idx) = _scan_extended(data, idx, delta)
+        if 13 <= length:
+            if (13 == length) and (idx < end):
+                length = 13 + data[idx]
+                idx += 1
+            elif (14 == length) and (idx + 1 < end):
+                length = 269 + ((data[idx] << 8) | data[idx + 1])
+                idx += 2
+            else:
+                (length, idx) = _scan_extended(data, idx, length)
+        option_number += delta
+        append((option_number, idx, length))
+        idx += length
+    return (entries, min(idx, end))
 
 
 def decode_options(data):
@@ -752,18 +911,22 @@ def decode_options(data):
 
     This will raise :exc:`OptionDecodeError` or other exceptions if
     the option data is malformed, but does no semantic validation"""
-    idx = 0
-    option_number = 0
+    if not isinstance(data, bytes):
+        data = bytes(data)
+    # Scan a bytearray view (avoids 2to3 ord/chr issues) but slice
+    # values from the original bytes so each costs a single copy.
+    (entries, end) = _scan_options(bytearray(data))
+    if not entries:
+        return (None, data[end:])
+    # Scanned option numbers are non-negative integers, so skip the
+    # argument validation in find_option().  Out-of-range numbers are
+    # still rejected by UnrecognizedOption.
+    lookup = _find_option_fast
     options = []
-    data = bytearray(data)      # avoid 2to3 ord/chr issues
-    while 0 < len(data):
-        (delta, length, data) = _decode_one_option(data)
-        if delta is None:
-            break
-        option_number += delta
-        option_type = find_option(option_number)
-        packed = bytes(data[:length])
-        data = data[length:]
+    append = options.append
+    for (option_number, offset, length) in entries:
+        option_type = lookup(option_number)
+        packed = data[offset:offset + length]
         opt = None
         if option_type is not None:
             try:
@@ -772,10 +935,8 @@ def decode_options(data):
                 pass
         if opt is None:
             opt = UnrecognizedOption(option_number, packed_value=packed)
-        options.append(opt)
-    if 0 == len(options):
-        options = None
-    return (options, bytes(data))
+        append(opt)
+    return (options, data[end:])
 
 
 class UnrecognizedOption (UrOption):
@@ -798,6 +959,8 @@ class UnrecognizedOption (UrOption):
        recognized option.
     """
 
+    __slots__ = ('__number', '_num')
+
     _RegisterOption = False
     _repeatable = (True, True)
     format = format_opaque(1034)
@@ -814,12 +977,22 @@ class UnrecognizedOption (UrOption):
     def name(self):
         return 'UnrecognizedOption<{0:d}>'.format(self.number)
 
+    def is_critical(self):
+        return bool(is_critical_option(self.__number))
+
+    def is_unsafe(self):
+        return bool(is_unsafe_option(self.__number))
+
+    def is_no_cache_key(self):
+        return is_no_cache_key_option(self.__number)
+
     def __init__(self, number, unpacked_value=None, packed_value=None):
         if not isinstance(number, int):
             raise TypeError(number)
         if (0 > number) or (65535 < number):
             raise ValueError(number)
         self.__number = number
+        self._num = number
         super(UnrecognizedOption, self).__init__(unpacked_value=unpacked_value,
                                                  packed_value=packed_value)
 
@@ -953,6 +1126,11 @@ class ContentFormat (UrOption):
     """:coapsect:`12.3` deriving from :rfc:`4627`."""
     media_type_for_content[APPLICATION_JSON] = 'application/json'
 
+    content_for_media_type = dict((_mt, _cf) for (_cf, _mt)
+                                  in media_type_for_content.iteritems())
+    """The inverse of :attr:`media_type_for_content`: a map from
+    media type strings to the integer content format value."""
+
 
 class MaxAge (UrOption):
     """Option encoding the maximum time (in seconds) that a response
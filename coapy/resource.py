@@ -26,16 +26,39 @@ import logging
 _log = logging.getLogger(__name__)
 
 import re
+import coapy
+
+
+class LinkFormatError (ValueError, coapy.CoAPyException):
+    """Exception raised when text cannot be parsed as :rfc:`6690`
+    link-format.
+
+    The *args* are ``(text, offset)`` where *offset* is the position
+    in *text* at which parsing failed.
+    """
+    pass
 
 
 class LinkValue(object):
     #: Regular expression to match strings enclosed in double quotes,
     #: allowing escaped double quotes inside.
-    _DQUOTED_re = re.compile('"(?P<text>(?:[^"\\\\]|(?:\\\\.))*)"', re.DOTALL)
+    _DQUOTED_re = re.compile(r'"(?P<text>(?:[^"\\]|\\.)*)"', re.DOTALL)
 
     #: Regular expression to match Link Format parameter value as
-    #: unquoted token.
-    _PTOKEN_re = re.compile('^[!#$%&\'()*+\-./0-9:<=>?@a-zA-Z\[\]^_`{|}~]{1,}$')
+    #: unquoted token.  ``\Z`` rather than ``$`` so a value with a
+    #: trailing newline is quoted.
+    _PTOKEN_re = re.compile(r'[!#$%&\'()*+\-./0-9:<=>?@a-zA-Z\[\]^_`{|}~]+\Z')
+    _match_ptoken = _PTOKEN_re.match
+
+    #: Regular expression matching one token of a Link Format
+    #: document: a bracketed target URI, a parameter name, a quoted or
+    #: unquoted parameter value, or the comma separating link values.
+    #: The name of the matched group identifies the token type.
+    _LinkToken_re = re.compile(r'<(?P<uri>[^>]*)>'
+                               r'|;(?P<key>[^=;,]*)'
+                               r'|="(?P<dq>(?:[^"\\]|\\.)*)"'
+                               r'|=(?P<ptok>[^;,]*)'
+                               r'|(?P<comma>,)', re.DOTALL)
 
     @property
     def target_uri(self):
@@ -78,57 +101,69 @@ class LinkValue(object):
         No attempt is (currently) made to implement the requirements
         of :rfc:`2231`.
         """
-        rv = []
-        rv.append('<{}>'.format(self.__target_uri))
-        if 0 < len(self.__params):
-            # Sort for reproducibility
-            for (k, v) in sorted(self.__params.iteritems()):
-                if v is None:
-                    rv.append(k)
-                elif self._PTOKEN_re.match(v):
-                    rv.append('{}={}'.format(k, v))
-                else:
-                    rv.append('{}="{}"'.format(k, v.replace(r'"', r'\"')))
+        target = '<%s>' % (self.__target_uri,)
+        if not self.__params:
+            return target
+        rv = [target]
+        is_ptoken = self._match_ptoken
+        append = rv.append
+        # Sort for reproducibility
+        for (k, v) in sorted(self.__params.iteritems()):
+            if v is None:
+                append(k)
+            elif is_ptoken(v):
+                append('%s=%s' % (k, v))
+            else:
+                append('%s="%s"' % (k, v.replace(r'"', r'\"')))
         return ';'.join(rv)
 
     @classmethod
     def from_link_format(cls, text):
+        """Parse :rfc:`6690` link-format *text* into a list of
+        instances of *cls*.
+
+        *text* may also be the UTF-8 encoded data of a message
+        payload; it is decoded before parsing.
+
+        Raises :exc:`LinkFormatError` if *text* is not well-formed.
+        """
+        if isinstance(text, bytes):
+            text = text.decode('utf-8')
         link_values = []
+        names = {}
+        match = cls._LinkToken_re.match
         len_text = len(text)
         ofs = 0
-        while (ofs < len_text) and ('<' == text[ofs]):
-            rbi = text.find('>', ofs+1)
-            if rbi < 0:
-                raise Exception
-            uri = text[ofs+1:rbi]
-            ofs = rbi+1
-            params = {}
-            while (ofs < len_text) and (';' == text[ofs]):
-                ofs += 1
-                eqi = text.find('=', ofs)
-                cmi = text.find(',', ofs)
-                cli = text.find(';', ofs)
-                ni = min([_i for _i in (eqi, cmi, cli, len_text) if (0 <= _i)])
-                k = text[ofs:ni]
-                ofs = ni
-                if (ofs < len(text)) and ('=' == text[ofs]):
-                    ofs += 1
-                    mo = cls._DQUOTED_re.match(text, ofs)
-                    if mo is not None:
-                        v = mo.group('text')
-                        ofs = mo.end()
-                    else:
-                        vei = min([_i for _i in (cmi, cli, len_text) if (0 <= _i)])
-                        v = text[ofs:vei]
-                        ofs = vei
-                    params[k] = v
-                else:
-                    params[k] = None
-            link_values.append(cls(uri, params))
-            if (ofs < len_text) and (',' == text[ofs]):
-                ofs += 1
+        uri = None
+        params = None
+        key = None
+        while ofs < len_text:
+            mo = match(text, ofs)
+            if mo is None:
+                raise LinkFormatError(text, ofs)
+            kind = mo.lastgroup
+            ofs = mo.end()
+            if uri is None:
+                # Each link value must start with its target URI
+                if 'uri' != kind:
+                    raise LinkFormatError(text, mo.start())
+                uri = mo.group('uri')
+                params = {}
+                key = None
+            elif 'key' == kind:
+                # Share one string per distinct name across the link
+                # values of the document.
+                key = mo.group('key')
+                key = names.setdefault(key, key)
+                params[key] = None
+            elif 'comma' == kind:
+                link_values.append(cls(uri, params))
+                uri = None
+            elif (key is not None) and (kind in ('dq', 'ptok')):
+                params[key] = mo.group(kind)
+                key = None
             else:
-                break
-        if ofs < len_text:
-            raise Exception
+                raise LinkFormatError(text, mo.start())
+        if uri is not None:
+            link_values.append(cls(uri, params))
         return link_values
@@ -66,6 +66,27 @@ class ClassReadOnly (object):
         self.value = value
 
 
+class _ReadOnlyValue (object):
+    """Data descriptor returning a fixed value and rejecting
+    assignment and deletion.  Installed by :class:`ReadOnlyMeta` in
+    place of each :class:`ClassReadOnly` marker.
+    """
+
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __get__(self, instance, owner=None):
+        return self.value
+
+    def __set__(self, instance, value):
+        raise AttributeError('read-only attribute')
+
+    def __delete__(self, instance):
+        raise AttributeError('read-only attribute')
+
+
 class ReadOnlyMeta (type):
     """Metaclass for supporting read-only values in classes.
 
@@ -73,22 +94,30 @@ class ReadOnlyMeta (type):
     prevents assignment to certain attributes at both the instance and
     class levels.  Any attribute in the class that is initialized in
     the class body with a value of type :class:`ClassReadOnly` is made
-    read-only.
+    read-only.  Classes that do not introduce such attributes reuse
+    the metaclass of their base.
 
     See example at :class:`ClassReadOnly`.
 
     """
     def __new__(cls, name, bases, namespace):
+        # Classes that introduce no read-only values need no
+        # intermediary type; any they inherit are already enforced by
+        # the metaclass of their base.
+        ro_items = [(_n, _v) for (_n, _v) in namespace.iteritems()
+                    if isinstance(_v, ClassReadOnly)]
+        if not ro_items:
+            return super(ReadOnlyMeta, cls).__new__(cls, name, bases, namespace)
+
         # Provide a unique type that can hold the read-only class
         # values.
         class ReadOnly (cls):
             pass
-        nsdup = namespace.copy()
-        for (n, v) in namespace.iteritems():
-            if isinstance(v, ClassReadOnly):
-                mp = property(lambda self_or_cls, _v=v.value: _v)
-                nsdup[n] = mp
-                setattr(ReadOnly, n, mp)
+        nsdup = dict(namespace)
+        for (n, v) in ro_items:
+            mp = _ReadOnlyValue(v.value)
+            nsdup[n] = mp
+            setattr(ReadOnly, n, mp)
         return super(ReadOnlyMeta, cls).__new__(ReadOnly, name, bases, nsdup)
 
 
@@ -109,15 +138,21 @@ class TimeDueOrdinal(object):
     *time_due* as a keyword parameter initializes :attr:`time_due` and
     is removed from *kw*.  Any positional parameters and remaining
     keyword parameters are passed to the next superclass.
-    """
 
-    time_due = None
-    """The time at which the subclass instance becomes relevant.
+    Instances hold :attr:`time_due` in a slot and have no
+    ``__dict__``; subclasses that declare their own ``__slots__``
+    keep that property.
+
+    .. attribute:: time_due
+
+       The time at which the subclass instance becomes relevant.
 
-    This is a value in the ordinal space defined by
-    :func:`coapy.clock`.
+       This is a value in the ordinal space defined by
+       :func:`coapy.clock`, or ``None`` if not yet assigned.
     """
 
+    __slots__ = ('time_due',)
+
     def __init__(self, *args, **kw):
         self.time_due = kw.pop('time_due', None)
         super(TimeDueOrdinal, self).__init__(*args, **kw)
@@ -132,21 +167,64 @@ class TimeDueOrdinal(object):
     def __lt__(self, other):
         return self.time_due < other.time_due
 
-    def queue_reposition(self, queue):
+    def __queue_index(self, queue, time_due):
+        # Locate this instance in *queue*, where it was placed when its
+        # time_due was *time_due*, by bisecting to the first element
+        # due at *time_due* and scanning forward for identity.  The
+        # bisection is done here rather than with the bisect module
+        # since this instance may already hold a different value and
+        # so must not be compared by time_due.
+        (lo, hi) = (0, len(queue))
+        while lo < hi:
+            mid = (lo + hi) // 2
+            elt = queue[mid]
+            if elt is self:
+                return mid
+            if elt.time_due < time_due:
+                lo = mid + 1
+            else:
+                hi = mid
+        for idx in xrange(lo, len(queue)):
+            if queue[idx] is self:
+                return idx
+        raise ValueError(self)
+
+    def queue_reposition(self, queue, old_time_due=None):
         """Reposition this entry within *queue*.
 
         *self* must already be in the queue; only its position changes
-        (if necessary).
+        (if necessary).  The entry is located by identity, since
+        equality only compares :attr:`time_due`.  If *old_time_due* is
+        the value under which the entry was queued it is found by
+        bisection; otherwise the queue is scanned.  It is moved only
+        if its new value violates the order relative to its neighbors,
+        and the search for the new position is restricted to the side
+        toward which it moves.
         """
-        bisect.insort(queue, queue.pop(queue.index(self)))
+        if old_time_due is None:
+            idx = next(_i for (_i, _e) in enumerate(queue) if _e is self)
+        else:
+            idx = self.__queue_index(queue, old_time_due)
+        if (0 < idx) and (self < queue[idx - 1]):
+            del queue[idx]
+            bisect.insort_right(queue, self, 0, idx)
+        elif (idx + 1 < len(queue)) and (queue[idx + 1] < self):
+            del queue[idx]
+            bisect.insort_right(queue, self, idx)
 
     def queue_insert(self, queue):
         """Insert this entry into *queue*."""
         bisect.insort(queue, self)
 
     def queue_remove(self, queue):
-        """Remove this entry from *queue*."""
-        queue.remove(self)
+        """Remove this entry from *queue*.
+
+        The entry is found by bisecting to the first element due at
+        the same time and scanning forward for this instance, rather
+        than comparing against every preceding element.  Raises
+        :exc:`python:ValueError` if the entry is not in *queue*.
+        """
+        del queue[self.__queue_index(queue, self.time_due)]
 
     @staticmethod
     def queue_ready_prefix(queue, now=None):
@@ -159,10 +237,15 @@ class TimeDueOrdinal(object):
 
         if now is None:
             now = coapy.clock()
-        ub = 0
-        while ub < len(queue) and (queue[ub].time_due <= now):
-            ub += 1
-        return list(queue[:ub])
+        # An unqueued instance due at *now* sorts after every element
+        # with an equal or earlier time_due.
+        return queue[:bisect.bisect_right(queue, TimeDueOrdinal(time_due=now))]
+
+
+# Map from non-ASCII text to its Net-Unicode encoding, discarded
+# wholesale when it reaches _NetUnicodeCacheLimit entries.
+_NetUnicodeCache = {}
+_NetUnicodeCacheLimit = 1024
 
 
 def to_net_unicode(text):
@@ -177,8 +260,19 @@ def to_net_unicode(text):
     values of options with format :class:`coapy.option.format_string`
     and diagnostic payloads.
     """
-    # At first blush, this is Net-Unicode.
-    return unicodedata.normalize('NFC', text).encode('utf-8')
+    # ASCII text is already in NFC, and its UTF-8 encoding is itself.
+    try:
+        return text.encode('ascii')
+    except UnicodeError:
+        pass
+    data = _NetUnicodeCache.get(text)
+    if data is None:
+        # At first blush, this is Net-Unicode.
+        data = unicodedata.normalize('NFC', text).encode('utf-8')
+        if _NetUnicodeCacheLimit <= len(_NetUnicodeCache):
+            _NetUnicodeCache.clear()
+        _NetUnicodeCache[text] = data
+    return data
 
 
 def to_display_text(data):
@@ -211,6 +305,32 @@ def to_display_text(data):
     return unicode(data)
 
 
+# Octets never escaped by url_quote, matching urllib.quote.
+_URLAlwaysSafe = (b'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+                  b'abcdefghijklmnopqrstuvwxyz'
+                  b'0123456789_.-')
+
+# Map from the safe argument of url_quote to a pair (octets, quoter)
+# where octets holds the octets left unescaped and quoter maps each
+# octet to its quoted text.
+_URLQuoters = {}
+
+
+def _url_quoter(safe):
+    octets_quoter = _URLQuoters.get(safe)
+    if octets_quoter is None:
+        octets = _URLAlwaysSafe + safe.encode('ascii')
+        table = {}
+        for i in xrange(256):
+            c = chr(i)
+            if c in octets:
+                table[c] = c.decode('ascii')
+            else:
+                table[c] = '%{0:02X}'.format(i)
+        octets_quoter = _URLQuoters[safe] = (octets, table.__getitem__)
+    return octets_quoter
+
+
 def url_quote(text, safe='/'):
     """Perform URL percent encoding on *text*.
 
@@ -226,16 +346,21 @@ def url_quote(text, safe='/'):
     works directly on Unicode strings, while in Python 2 the
     corresponding :func:`python:urllib.quote` does not tolerate
     Unicode characters and does not like *safe* to be a Unicode
-    string as it is since we use unicode_literals).
+    string as it is since we use unicode_literals).  In Python 2
+    each octet is translated through a table built once per *safe*,
+    and data with no octet to escape is returned without translation.
     """
 
     if isinstance(text, unicode):
         text = to_net_unicode(text)
     if sys.version_info < (3, 0):
-        # Python 2 quote does not like having a Unicode safe string
-        safe = str(safe)
-    quoted = urllib.quote(text, safe)
-    return quoted
+        (octets, quoter) = _url_quoter(safe)
+        # Deleting the safe octets leaves nothing when there is
+        # nothing to escape.
+        if not text.translate(None, octets):
+            return text.decode('ascii')
+        return ''.join(map(quoter, text))
+    return urllib.quote(text, safe)
 
 
 def url_unquote(quoted):
@@ -246,7 +371,12 @@ def url_unquote(quoted):
     strings, while in Python 2 the corresponding
     :func:`python:urllib.unquote` does not tolerate Unicode
     characters.
+
+    Text without a percent sign needs no decoding and is returned
+    as-is.
     """
+    if ('%' not in quoted) and isinstance(quoted, unicode):
+        return quoted
     if sys.version_info < (3, 0):
         data = bytes(quoted)
         encoded = urllib.unquote(data)
@@ -256,6 +386,75 @@ def url_unquote(quoted):
     return text
 
 
+# Handlers for format_time, each invoked as handler(dt, tt, pt, jd,
+# sod) where dt is the datetime, tt its timetuple, pt its POSIX
+# ordinal, jd its Julian Date, and sod its second-of-day.  Each
+# returns (rep, exp).  86400 seconds per day, 43200 seconds per
+# half-day.
+
+
+def _format_time_iso(dt, tt, pt, jd, sod):
+    return (dt.isoformat(), 0)
+
+
+def _format_time_ord(dt, tt, pt, jd, sod):
+    return ('{0:d}-{1:03d}'.format(dt.year, tt.tm_yday), 86400 - sod)
+
+
+def _format_time_pgd(dt, tt, pt, jd, sod):
+    return (dt.toordinal(), 86400 - sod)
+
+
+def _format_time_jd(dt, tt, pt, jd, sod):
+    return (jd, 0)
+
+
+def _format_time_mjd(dt, tt, pt, jd, sod):
+    return (jd - 2400000.5, 0)
+
+
+def _format_time_tjd(dt, tt, pt, jd, sod):
+    return (jd - 2440000.5, 0)
+
+
+def _format_time_jdn(dt, tt, pt, jd, sod):
+    exp = 43200 - sod
+    if 0 > exp:
+        exp += 86400
+    return (int(jd), exp)
+
+
+def _format_time_doy(dt, tt, pt, jd, sod):
+    return (tt.tm_yday, 86400 - sod)
+
+
+def _format_time_dow(dt, tt, pt, jd, sod):
+    return (dt.isoweekday(), 86400 - sod)
+
+
+def _format_time_mod(dt, tt, pt, jd, sod):
+    return (dt.minute + 60 * (dt.hour), 60 - dt.second)
+
+
+def _format_time_posix(dt, tt, pt, jd, sod):
+    return (pt, 0)
+
+
+_FormatTimeHandlers = {
+    'iso': _format_time_iso,     # ISO8601 combined date and time
+    'ord': _format_time_ord,     # ISO 8601 ordinal date
+    'pgd': _format_time_pgd,     # Proleptic Gregorian Day
+    'jd': _format_time_jd,       # Julian Date
+    'mjd': _format_time_mjd,     # Modified Julian Date
+    'tjd': _format_time_tjd,     # Truncated Julian Date
+    'jdn': _format_time_jdn,     # Julian Day Number
+    'doy': _format_time_doy,     # Day of Year
+    'dow': _format_time_dow,     # Day of Week (ISO M=1 Su=7)
+    'mod': _format_time_mod,     # Minute of day
+    'posix': _format_time_posix,  # Seconds since POSIX epoch 1970-01-01T00:00:00
+}
+
+
 def format_time(tval=None, format='iso'):
     """Convert a date/time value to a standard representation and
     validity duration.
@@ -297,44 +496,15 @@ def format_time(tval=None, format='iso'):
         dt = datetime.datetime.utcfromtimestamp(tval)
     else:
         raise ValueError(tval)
+    try:
+        handler = _FormatTimeHandlers[format]
+    except KeyError:
+        raise ValueError(format)
     tt = dt.timetuple()
     pt = calendar.timegm(tt)
     jd = 2440587.5 + (pt / 86400.0)
-    exp = 0
     sod = dt.second + 60 * (dt.minute + 60 * dt.hour)
-    # 86400 seconds per day, 43200 seconds per half-day
-    if 'iso' == format:         # ISO8601 combined date and time
-        rep = dt.isoformat()
-    elif 'ord' == format:       # ISO 8601 ordinal date
-        rep = '{0:d}-{1:03d}'.format(dt.year, dt.timetuple().tm_yday)
-        exp = 86400 - sod
-    elif 'pgd' == format:       # Proleptic Gregorian Day
-        rep = dt.toordinal()
-        exp = 86400 - sod
-    elif 'jd' == format:        # Julian Date
-        rep = jd
-    elif 'mjd' == format:       # Modified Julian Date
-        rep = jd - 2400000.5
-    elif 'tjd' == format:       # Truncated Julian Date
-        rep = jd - 2440000.5
-    elif 'jdn' == format:       # Julian Day Number
-        rep = int(jd)
-        exp = 43200 - sod
-        if 0 > exp:
-            exp += 86400
-    elif 'doy' == format:       # Day of Year
-        rep = dt.timetuple().tm_yday
-        exp = 86400 - sod
-    elif 'dow' == format:       # Day of Week (ISO M=1 Su=7)
-        rep = dt.isoweekday()
-        exp = 86400 - sod
-    elif 'mod' == format:       # Minute of day
-        rep = dt.minute + 60 * (dt.hour)
-        exp = 60 - dt.second
-    elif 'posix' == format:     # Seconds since POSIX epoch 1970-01-01T00:00:00
-        rep = calendar.timegm(tt)
-    else:
-        raise ValueError(format)
+    (rep, exp) = handler(dt, tt, pt, jd, sod)
     # Don't add CJD, which is local civil time not UT
     return (rep, exp)
 
@@ -43,6 +43,8 @@ import time
 import socket
 import struct
 import re
+import threading
+import collections
 
 import coapy.util
 from coapy.httputil import *
@@ -82,25 +84,55 @@ class TimeResource(HTTPResource):
     expiration = None
     """The time at which the resource value becomes obsolete."""
 
+    # (timestamp, {format: (content, headers, vsec)}) for the most recently
+    # formatted timestamp.  Replaced, never mutated across timestamps,
+    # so concurrent requests see a consistent pair.
+    __formatted = None
+
+    def representation(self, timestamp, format):
+        """Return ``(content, headers, vsec)`` where *content* is the
+        encoded response body holding :func:`coapy.util.format_time`
+        of *timestamp* in *format*, *headers* is the encoded
+        ``Content-Type`` and ``Content-Length`` header lines for that
+        body, and *vsec* its validity duration.  The result is reused
+        when the same timestamp has already been formatted that way."""
+        formatted = self.__formatted
+        if (formatted is None) or (formatted[0] != timestamp):
+            formatted = (timestamp, {})
+            self.__formatted = formatted
+        result = formatted[1].get(format)
+        if result is None:
+            (rep, vsec) = coapy.util.format_time(timestamp, format=format)
+            content = coapy.util.to_display_text('{0!s}\n'.format(rep)).encode('ascii')
+            headers = (b'Content-Type: text/plain\r\nContent-Length: '
+                       + str(len(content)) + b'\r\n')
+            result = (content, headers, vsec)
+            formatted[1][format] = result
+        return result
+
     def do_GET(self, request, head_only=False):
         format = request.split_uri.query
         if not format:
             format = 'iso'
         timestamp = self.timestamp
-        expiration = self.expiration
-        if timestamp is None:
-            timestamp = time.time()
+        is_now = timestamp is None
+        if is_now:
+            # Whole seconds, the resolution of the HTTP headers, so
+            # requests within the same second share a representation.
+            timestamp = int(time.time())
         try:
-            (rep, vsec) = coapy.util.format_time(timestamp, format=format)
+            (content, headers, vsec) = self.representation(timestamp, format)
         except ValueError:
-            request.send_error(400, 'Bad format {0}'.format(format))
+            request.send_error(400, 'Bad format %s' % (format,))
             return
-        content = coapy.util.to_display_text('{0!s}\n'.format(rep)).encode('ascii')
-        request.send_response(200)
-        request.send_header('Content-Type', 'text/plain')
-        request.send_header('Content-Length', len(content))
-        if self.timestamp is None:
+        if is_now:
             expiration = timestamp + vsec
+        else:
+            expiration = self.expiration
+        request.send_response(200)
+        # As send_header would, but with the header lines preformatted
+        if 'HTTP/0.9' != request.request_version:
+            request.wfile.write(headers)
         if expiration is not None:
             request.send_header('Expires', request.date_time_string(expiration))
         request.end_headers()
@@ -116,14 +148,21 @@ class BlackboardResource(HTTPResource):
       curl -D- 'http://localhost:8000/blackboard/foo'
       curl -X DELETE -D- 'http://localhost:8000/blackboard/foo'
       curl -D- 'http://localhost:8000/blackboard/foo'
+
+    At most *capacity* postings are retained; creating one beyond that
+    discards the posting least recently created, retrieved, or updated.
     """
 
+    capacity = None
+    """The maximum number of postings retained."""
+
     class PostingData(object):
         key = None
         content_type = None
         content = None
         updates = None
         last_update = None
+        etag = None
 
         def __init__(self, key, content, content_type):
             self.key = key
@@ -131,42 +170,73 @@ class BlackboardResource(HTTPResource):
             self.content_type = content_type
             self.updates = 0
             self.last_update = time.time()
+            self._set_etag()
 
-    def __init__(self, path, handler_class=HTTPRequestHandler):
+        def update(self, content, content_type):
+            self.content = content
+            self.content_type = content_type
+            self.updates += 1
+            self.last_update = time.time()
+            self._set_etag()
+
+        def _set_etag(self):
+            # Changes whenever the content may have changed.
+            self.etag = '"{0:x}-{1:d}"'.format(int(self.last_update * 1000), self.updates)
+
+    def __init__(self, path, handler_class=HTTPRequestHandler, capacity=1024):
         super(BlackboardResource, self).__init__(path, handler_class)
-        self.__postings = {}
+        self.capacity = capacity
+        # Ordered from least to most recently used.
+        self.__postings = collections.OrderedDict()
+        # Requests are served concurrently; this serializes changes to
+        # the postings.
+        self.__lock = threading.Lock()
 
     def key_from_request(self, request):
+        # split_uri is parsed once per request by the handler.
+        path = self.path
         key = request.split_uri.path
-        if not key.startswith(self.path):
+        if key[:len(path)] != path:
             request.send_error(400, 'Bad path')
             return None
-        key = key[len(self.path):]
-        return key
+        return key[len(path):]
 
     def do_GET(self, request, head_only=False):
         key = self.key_from_request(request)
         if key is None:
             return
-        try:
-            record = self.__postings[key]
-        except KeyError:
+        with self.__lock:
+            record = self.__postings.pop(key, None)
+            if record is not None:
+                self.__postings[key] = record
+                # Snapshot together so a concurrent PUT cannot split them
+                (content, content_type, etag) = (record.content, record.content_type, record.etag)
+        if record is None:
             request.send_response(404)
             return
+        if_none_match = request.headers.get('If-None-Match')
+        if (if_none_match is not None) and \
+           (('*' == if_none_match.strip())
+                or (etag in (_t.strip() for _t in if_none_match.split(',')))):
+            request.send_response(304)
+            request.send_header('ETag', etag)
+            request.end_headers()
+            return
         request.send_response(200)
-        request.send_header('Content-Type', record.content_type)
-        request.send_header('Content-Length', len(record.content))
+        request.send_header('ETag', etag)
+        request.send_header('Content-Type', content_type)
+        request.send_header('Content-Length', len(content))
         request.end_headers()
         if not head_only:
-            request.wfile.write(record.content)
+            request.wfile.write(content)
 
     def do_DELETE(self, request, head_only=False):
         key = self.key_from_request(request)
         if key is None:
             return
-        try:
-            del self.__postings[key]
-        except KeyError:
+        with self.__lock:
+            record = self.__postings.pop(key, None)
+        if record is None:
             request.send_response(404)
             return
         request.send_response(204)
@@ -175,16 +245,23 @@ class BlackboardResource(HTTPResource):
         key = self.key_from_request(request)
         if key is None:
             return
-        try:
-            record = self.__postings[key]
-            request.send_response(409)
-            return
-        except KeyError:
-            pass
+        # Drain the body even if the posting exists, leaving the
+        # connection positioned at the next request.
         content = request.rfile.read(int(request.headers['Content-Length']))
         content_type = request.headers['Content-Type']
-        _log.info('{0} create {1} as {2}'.format(self.path, key, content_type))
-        self.__postings[key] = self.PostingData(key, content, content_type)
+        record = self.PostingData(key, content, content_type)
+        evicted = None
+        with self.__lock:
+            postings = self.__postings
+            if (self.capacity <= len(postings)) and (key not in postings):
+                (evicted, _) = postings.popitem(last=False)
+            created = postings.setdefault(key, record) is record
+        if not created:
+            request.send_response(409)
+            return
+        if evicted is not None:
+            _log.info('%s evict %s', self.path, evicted)
+        _log.info('%s create %s as %s', self.path, key, content_type)
         request.send_response(201)
         request.send_header('Location', request.server.make_uri(''.join([self.path, key])))
         request.end_headers()
@@ -193,15 +270,25 @@ class BlackboardResource(HTTPResource):
         key = self.key_from_request(request)
         if key is None:
             return
-        try:
-            record = self.__postings[key]
-        except KeyError:
+        with self.__lock:
+            record = self.__postings.get(key)
+        if record is None:
+            request.send_response(404)
+            return
+        content = request.rfile.read(int(request.headers['Content-Length']))
+        content_type = request.headers['Content-Type']
+        with self.__lock:
+            postings = self.__postings
+            # The posting may have been deleted or evicted while the
+            # body was read.
+            updated = postings.get(key) is record
+            if updated:
+                del postings[key]
+                postings[key] = record
+                record.update(content, content_type)
+        if not updated:
             request.send_response(404)
             return
-        record.content = request.rfile.read(int(request.headers['Content-Length']))
-        record.content_type = request.headers['Content-Type']
-        record.updates += 1
-        record.last_update = time.time()
         request.send_response(204)
 
 
@@ -280,7 +367,5 @@ BlockResource('/block')
 # interface the request came in on, and we need a valid host to
 # provide the URI for newly created resources.
 server_address = ('localhost', 8000)
-httpd = HTTPServer(server_address, HTTPRequestHandler)
-
-while True:
-    httpd.handle_request()
+httpd = ThreadingHTTPServer(server_address, HTTPRequestHandler)
+httpd.serve_forever()
@@ -26,9 +26,12 @@ from __future__ import division
 
 import coapy
 import coapy.endpoint
+import coapy.message
 import socket
 import errno
 import unittest
+import collections
+import itertools
 import logging.handlers
 
 
@@ -51,22 +54,24 @@ class FIFOEndpoint (coapy.endpoint.LocalEndpoint):
 
         The contents of the fifo may be inspected and manipulated to
         test endpoint network delivery without involving real sockets.
+        It is a :class:`python:collections.deque`, so delivery from
+        the head is constant-time.
         """
         return self.__fifo
 
-    __fifo_idx = 0
+    # Source of the unique index in each instance's host name.
+    __fifo_idx = itertools.count()
 
     def __new__(cls, **kw):
         # It is "safe" to override __new__ here because we always want
         # a unique endpoint; we don't have to rely on the lookup for a
         # previously created one that will be done in the base
         # implementation.
-        host = 'fifo # {0}'.format(cls.__fifo_idx)
-        cls.__fifo_idx += 1
+        host = 'fifo # %d' % (next(cls.__fifo_idx),)
         return super(FIFOEndpoint, cls).__new__(cls, host=host, port=coapy.COAP_PORT, family=None)
 
     def _reset(self):
-        self.__fifo = []
+        self.__fifo = collections.deque()
         super(FIFOEndpoint, self)._reset()
 
     def _rawsendto(self, data, destination_endpoint):
@@ -89,18 +94,43 @@ class FIFOEndpoint (coapy.endpoint.LocalEndpoint):
         """
         if 0 == len(self.fifo):
             raise socket.error(errno.EAGAIN, 'Resource temporarily unavailable')
-        return self.fifo.pop(0)
+        return self.fifo.popleft()
+
+
+class RingBufferHandler (logging.handlers.BufferingHandler):
+    """A :class:`python:logging.handlers.BufferingHandler` that retains
+    the most recent *capacity* records.
+
+    The :attr:`buffer<python:logging.handlers.BufferingHandler.buffer>`
+    is a :class:`python:collections.deque` bounded to *capacity*, so
+    once full each new record displaces the oldest rather than
+    causing the whole buffer to be discarded.  :meth:`flush` empties
+    the buffer.
+    """
+
+    def __init__(self, capacity):
+        logging.handlers.BufferingHandler.__init__(self, capacity)
+        self.buffer = collections.deque(maxlen=capacity)
+
+    def emit(self, record):
+        self.buffer.append(record)
+
+    def flush(self):
+        self.acquire()
+        try:
+            self.buffer.clear()
+        finally:
+            self.release()
 
 
 class LogHandler_mixin(object):
-    """Extension that registers a
-    :class:`python:logging.handlers.BufferingHandler` for loggers used
-    in CoAPy modules to capture the log messages for diagnostic
-    verification.
+    """Extension that registers a :class:`RingBufferHandler` for
+    loggers used in CoAPy modules to capture the log messages for
+    diagnostic verification.
 
     This implementation currently assumes that only the root logger
     has set the log message level.  For the duration of the test, this
-    level is reset to 1 (enabling capture of records at all levels).
+    level is reset to :attr:`LOG_LEVEL`.
 
     .. note::
        Unit tests that make use of this feature should be sure to
@@ -112,14 +142,21 @@ class LogHandler_mixin(object):
 
     LOG_CAPACITY = 128
     """The number of records that the associated :attr:`log_handler`
-    should be able to retain.
+    should be able to retain.  Older records are discarded as newer
+    ones arrive.
+    """
+
+    LOG_LEVEL = logging.WARNING
+    """The level at which records are captured.  Records below this
+    level are rejected by the logger before they are created.  Tests
+    that examine debugging output should set this to 1 to capture
+    records at all levels.
     """
 
     @property
     def log_handler(self):
-        """Read-only reference to the
-        :class:`python:logging.handlers.BufferingHandler` that is
-        hooked into the logging infrastructure while the unit test is
+        """Read-only reference to the :class:`RingBufferHandler` that
+        is hooked into the logging infrastructure while the unit test is
         running.  The test case may access the log handler's
         :attr:`buffer<python:logging.handlers.BufferingHandler.buffer>`
         attribute to access the generated :class:`log
@@ -130,22 +167,22 @@ class LogHandler_mixin(object):
     def setUp(self):
         """Cooperative super-calling support to install managed clock."""
         super(LogHandler_mixin, self).setUp()
-        self.__log_handler = logging.handlers.BufferingHandler(self.LOG_CAPACITY)
-        self.__log_handler.setLevel(1)
-        self.__log_formatter = logging.Formatter()
-        self.__log_handler.setFormatter(self.__log_formatter)
+        self.__log_handler = RingBufferHandler(self.LOG_CAPACITY)
+        self.__log_handler.setLevel(self.LOG_LEVEL)
         self.__root_logger = logging.getLogger()
         self.__root_logger_level = self.__root_logger.getEffectiveLevel()
-        self.__root_logger.setLevel(1)
+        self.__root_logger.setLevel(self.LOG_LEVEL)
         self.__root_logger.addHandler(self.__log_handler)
 
     def tearDown(self):
         """Cooperative super-calling support to remove
         :attr:`log_handler`.
         """
-        if 0 < len(self.__log_handler.buffer):
+        buf = self.__log_handler.buffer
+        if buf:
+            fmt = self.__log_handler.format
             print("\n>>>UNPROCESSED LOG MESSAGES:")
-            print(''.join(map(self.__log_handler.format, self.__log_handler.buffer)))
+            print(''.join(fmt(_r) for _r in buf))
             print("\n<<<END UNPROCESSED LOG MESSAGES")
         self.__root_logger.removeHandler(self.__log_handler)
         self.__root_logger.setLevel(self.__root_logger_level)
@@ -184,19 +221,26 @@ class DeterministicBEBO_mixin(object):
 
     This class should be mixed-in as a base class along with
     :class:`python:unittest.TestCase` for tests that need
-    deterministic retransmission behavior.
+    deterministic retransmission behavior.  The same parameters
+    instance is shared by all such tests, which must not modify it.
     """
 
+    # The deterministic parameters, built on first use.
+    __DeterministicParameters = None
+
     def setUp(self):
         """Cooperative super-calling support to install deterministic
         transmission parameters.
         """
         super(DeterministicBEBO_mixin, self).setUp()
-        import coapy.message
+        tp = DeterministicBEBO_mixin.__DeterministicParameters
+        if tp is None:
+            tp = coapy.message.TransmissionParameters()
+            tp.ACK_RANDOM_FACTOR = 1.0
+            tp.recalculate_derived()
+            DeterministicBEBO_mixin.__DeterministicParameters = tp
         self.__transmission_parameters = coapy.transmissionParameters
-        coapy.transmissionParameters = coapy.message.TransmissionParameters()
-        coapy.transmissionParameters.ACK_RANDOM_FACTOR = 1.0
-        coapy.transmissionParameters.recalculate_derived()
+        coapy.transmissionParameters = tp
 
     def tearDown(self):
         """Cooperative super-calling support to return to default
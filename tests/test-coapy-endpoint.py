@@ -20,6 +20,7 @@ from __future__ import division
 
 
 import unittest
+import gc
 from coapy.endpoint import *
 from tests.support import *
 import coapy.option
@@ -75,6 +76,8 @@ class TestEndpoint (unittest.TestCase):
         with self.assertRaises(socket.gaierror) as cm:
             ep = Endpoint(host=naa)
         ep = Endpoint(host=naa, family=None)
+        with self.assertRaises(TypeError):
+            Endpoint(host=5)
         lep = Endpoint.lookup_endpoint(host=naa, family=None)
         self.assertTrue(lep is ep)
         ep2 = Endpoint(host=naa, family=None)
@@ -102,6 +105,14 @@ class TestEndpoint (unittest.TestCase):
         ep2 = Endpoint.lookup_endpoint(('192.168.0.1', 1234))
         self.assertEqual(ep, ep2)
 
+    def testRelease(self):
+        sa = ('192.168.0.2', 4321)
+        ep = Endpoint(sa)
+        self.assertTrue(ep is Endpoint.lookup_endpoint(sa))
+        del ep
+        gc.collect()
+        self.assertTrue(Endpoint.lookup_endpoint(sa) is None)
+
     def testStringize(self):
         naa = 'not an address'
         ep = Endpoint(host=naa, family=None)
@@ -146,6 +157,10 @@ class TestURLParse (unittest.TestCase):
         self.assertEqual('coap://[::1]/', base)
         self.assertEqual('coap://[::1]/path', urlparse.urljoin(base, '/path'))
         self.assertEqual('coap://[::1]/other', urlparse.urljoin(base + 'path/', '../other'))
+        self.assertEqual('coap://[::1]/path', ep.uri_join('/path'))
+        self.assertEqual('coap://[::1]/path?q', ep.uri_join('path?q'))
+        self.assertEqual('coap://host/path', ep.uri_join('//host/path'))
+        self.assertEqual('coap://host/', ep.uri_join('coap://host/'))
 
 
 class TestURLConversion (unittest.TestCase):
@@ -228,12 +243,29 @@ class TestURLConversion (unittest.TestCase):
         self.assertTrue(isinstance(opt, coapy.option.UriPath))
         self.assertEqual('core', opt.value)
 
+    def testBasePrefix(self):
+        ep = Endpoint(host='2001:db8::2:1')
+        url = ep.base_uri + 'a/%62?q'
+        opts = ep.uri_to_options(url)
+        self.assertEqual([coapy.option.UriPath, coapy.option.UriPath, coapy.option.UriQuery],
+                         [type(_o) for _o in opts])
+        self.assertEqual(['a', 'b', 'q'], [_o.value for _o in opts])
+        self.assertEqual([_o.value for _o in opts],
+                         [_o.value for _o in ep.uri_to_options('/a/b?q')])
+        with self.assertRaises(URIError) as cm:
+            ep.uri_to_options(url + '#frag')
+        self.assertEqual(cm.exception.args[0], 'not absolute')
+
     def testInvalidToOpts(self):
         ep = Endpoint(host='::1')
         with self.assertRaises(URIError) as cm:
             ep.uri_to_options('http://localhost/path')
         self.assertEqual(cm.exception.args[0], 'invalid scheme')
         self.assertEqual(cm.exception.args[1], 'http')
+        with self.assertRaises(URIError) as cm:
+            ep.uri_to_options('coap://[::1]:port/path')
+        self.assertEqual(cm.exception.args[0], 'invalid port')
+        self.assertEqual(cm.exception.args[1], 'port')
 
     def testInvalidFromOpts(self):
         ep = Endpoint(host='::1')
@@ -395,6 +427,7 @@ class TestMessageCache (ManagedClock_mixin,
         dep = FIFOEndpoint()
         c = MessageCache(sep, True)
         ce = SentMessageCacheEntry(c, Message(messageID=1), dep)
+        self.assertFalse(hasattr(ce, '__dict__'))
         self.assertTrue(ce.message.is_non_confirmable())
         self.assertTrue(ce in c.pending())
         self.assertFalse(ce in c.queue())
@@ -415,6 +448,7 @@ class TestMessageCache (ManagedClock_mixin,
         dep = FIFOEndpoint()
         c = MessageCache(dep, False)
         ce = RcvdMessageCacheEntry(c, Message(messageID=1))
+        self.assertFalse(hasattr(ce, '__dict__'))
         self.assertTrue(ce.message.is_non_confirmable())
         self.assertFalse(ce in c.pending())
         self.assertTrue(ce in c.queue())
@@ -540,6 +574,27 @@ class TestSentCache (DeterministicBEBO_mixin,
         self.assertEqual(0, len(cache))
         self.assertTrue(ce.cache is None)
 
+    def testProcessTimeouts(self):
+        tp = coapy.transmissionParameters
+        clk = coapy.clock
+        sep = FIFOEndpoint()
+        dep = FIFOEndpoint()
+        ce1 = sep.send(dep.create_request('/one', confirmable=True))
+        ce2 = sep.send(dep.create_request('/two', confirmable=True))
+        cache = ce1.cache
+        self.assertEqual(clk(), cache.next_due())
+        self.assertEqual(2, cache.process_timeouts())
+        self.assertEqual(clk() + tp.ACK_TIMEOUT, cache.next_due())
+        self.assertEqual(1, ce1.transmissions)
+        self.assertEqual(1, ce2.transmissions)
+        self.assertEqual(0, cache.process_timeouts())
+        clk.adjust(tp.ACK_TIMEOUT)
+        self.assertEqual(2, cache.process_timeouts())
+        self.assertEqual(2, ce1.transmissions)
+        self.assertEqual(4, len(dep.fifo))
+        cache.clear()
+        self.assertTrue(cache.next_due() is None)
+
     def testNONNoAck(self):
         tp = coapy.transmissionParameters
         self.assertEqual(tp.ACK_RANDOM_FACTOR, 1.0)
@@ -398,6 +398,14 @@ class TestUintFormat (unittest.TestCase):
         self.assertEqual(b'\x01\x02\x03\x04', uint.to_packed(0x1020304))
         self.assertRaises(OptionLengthError, uint.to_packed, 0x102030405)
 
+    def testNormalize(self):
+        uint = format_uint(2)
+        self.assertEqual(0, uint.normalize(0))
+        self.assertEqual(0xFFFF, uint.normalize(0xFFFF))
+        self.assertRaises(OptionLengthError, uint.normalize, 0x10000)
+        self.assertRaises(OptionLengthError, uint.normalize, -1)
+        self.assertRaises(TypeError, uint.normalize, b'\x01')
+
     def testUnpack(self):
         uint = format_uint(4)
         self.assertEqual(0, uint.from_packed(b''))
@@ -429,6 +437,20 @@ class TestUintFormat (unittest.TestCase):
         self.assertEqual(532, opt.value)
         self.assertRaises(OptionLengthError, UriPort, 65536)
 
+    def testPackedValue(self):
+        opt = UriPort(packed_value=b'\x00\x05')
+        self.assertEqual(5, opt.value)
+        pv = opt.packed_value
+        self.assertEqual(b'\x05', pv)
+        self.assertTrue(pv is opt.packed_value)
+        with self.assertRaises(AttributeError):
+            opt.extra = 1
+        opt.value = 0x1234
+        self.assertEqual(b'\x12\x34', opt.packed_value)
+        with self.assertRaises(OptionLengthError):
+            opt.value = 65536
+        self.assertEqual(b'\x12\x34', opt.packed_value)
+
     def testOptionCoding(self):
         uint2 = format_uint(2)
         self.assertRaises(TypeError, uint2.option_encoding, u'bad')
@@ -706,6 +728,14 @@ class TestContentFormat (unittest.TestCase):
                          ContentFormat.media_type_for_content[ContentFormat.APPLICATION_OCTET_STREAM])  # nopep8
         self.assertIsNone(ContentFormat.media_type_for_content.get(1))
 
+    def testReverseMap(self):
+        self.assertEqual(ContentFormat.APPLICATION_LINK_FORMAT,
+                         ContentFormat.content_for_media_type['application/link-format'])  # nopep8
+        self.assertEqual(len(ContentFormat.media_type_for_content),
+                         len(ContentFormat.content_for_media_type))
+        for (cf, mt) in ContentFormat.media_type_for_content.iteritems():
+            self.assertEqual(cf, ContentFormat.content_for_media_type[mt])
+
 
 if __name__ == '__main__':
     unittest.main()
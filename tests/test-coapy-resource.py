@@ -41,6 +41,7 @@ class TestLinkValue(unittest.TestCase):
         self.assertFalse(LinkValue._PTOKEN_re.match('with spaces'))
         self.assertFalse(LinkValue._PTOKEN_re.match('token,comma'))
         self.assertFalse(LinkValue._PTOKEN_re.match('token;semic'))
+        self.assertFalse(LinkValue._PTOKEN_re.match('token\n'))
 
     def testConstructor(self):
         lf = LinkValue('/path', {'title': 'something'})
@@ -67,6 +68,22 @@ class TestLinkValue(unittest.TestCase):
         self.assertEqual('/async', lv.target_uri)
         self.assertEqual(1, len(lv.params))
 
+    def testFromPayload(self):
+        lvs = LinkValue.from_link_format(b'</time>;rt="Ticks";ct=0')
+        self.assertEqual(1, len(lvs))
+        lv = lvs[0]
+        self.assertTrue(isinstance(lv.target_uri, unicode))
+        self.assertEqual('/time', lv.target_uri)
+        self.assertEqual({'rt': 'Ticks', 'ct': '0'}, lv.params)
+
+    def testMalformed(self):
+        with self.assertRaises(LinkFormatError) as cm:
+            LinkValue.from_link_format('</a>,;ct=0')
+        self.assertEqual(('</a>,;ct=0', 5), cm.exception.args)
+        self.assertRaises(LinkFormatError, LinkValue.from_link_format, '</a')
+        self.assertRaises(LinkFormatError, LinkValue.from_link_format, '</a>=0')
+        self.assertRaises(ValueError, LinkValue.from_link_format, 'junk')
+
     def testToLinkFormat(self):
         lv = LinkValue('/path', {})
         self.assertEqual('</path>', lv.to_link_format())
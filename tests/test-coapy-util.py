@@ -107,6 +107,13 @@ class TestNetUnicode (unittest.TestCase):
                          path_uq)
         dpath = url_unquote(path_uq)
         self.assertEqual(path, dpath)
+        self.assertTrue(isinstance(url_unquote('core'), unicode))
+        self.assertTrue(isinstance(url_unquote(b'core'), unicode))
+
+    def testASCII(self):
+        self.assertEqual(b'.well-known', to_net_unicode('.well-known'))
+        # U+0061 followed by U+0301 composes only under normalization
+        self.assertEqual(b'a\xc3\xa1', to_net_unicode('aa\u0301'))
 
 
 class TestToDisplayText (unittest.TestCase):
@@ -124,6 +131,8 @@ class TestTimeDueOrdinal (unittest.TestCase):
         td1 = TimeDueOrdinal(time_due=now)
         td0 = TimeDueOrdinal(time_due=now-1)
         self.assertTrue(td0 < td1)
+        self.assertRaises(AttributeError, setattr, td0, 'other', 1)
+        self.assertIsNone(TimeDueOrdinal().time_due)
         td2 = TimeDueOrdinal(time_due=now+1)
         queue = []
         td2.queue_insert(queue)
@@ -136,6 +145,48 @@ class TestTimeDueOrdinal (unittest.TestCase):
         self.assertEqual([td0], TimeDueOrdinal.queue_ready_prefix(queue, td0.time_due))
         self.assertEqual(queue, TimeDueOrdinal.queue_ready_prefix(queue, td2.time_due + 1))
 
+    def testReposition(self):
+        now = coapy.clock()
+        td0 = TimeDueOrdinal(time_due=now)
+        td1 = TimeDueOrdinal(time_due=now)
+        td2 = TimeDueOrdinal(time_due=now+1)
+        queue = []
+        td0.queue_insert(queue)
+        td1.queue_insert(queue)
+        td2.queue_insert(queue)
+        self.assertEqual([td0, td1, td2], queue)
+        td1.time_due = now + 2
+        td1.queue_reposition(queue)
+        self.assertTrue(queue[0] is td0)
+        self.assertTrue(queue[1] is td2)
+        self.assertTrue(queue[2] is td1)
+        td1.time_due = now - 1
+        td1.queue_reposition(queue)
+        self.assertTrue(queue[0] is td1)
+        self.assertTrue(queue[1] is td0)
+        self.assertTrue(queue[2] is td2)
+        td0.time_due = now + 3
+        td0.queue_reposition(queue, now)
+        self.assertTrue(queue[0] is td1)
+        self.assertTrue(queue[1] is td2)
+        self.assertTrue(queue[2] is td0)
+        self.assertRaises(ValueError, td1.queue_reposition, queue, now + 4)
+
+    def testRemove(self):
+        now = coapy.clock()
+        td0 = TimeDueOrdinal(time_due=now)
+        td1 = TimeDueOrdinal(time_due=now)
+        td2 = TimeDueOrdinal(time_due=now+1)
+        queue = []
+        td0.queue_insert(queue)
+        td1.queue_insert(queue)
+        td2.queue_insert(queue)
+        td1.queue_remove(queue)
+        self.assertEqual(2, len(queue))
+        self.assertTrue(queue[0] is td0)
+        self.assertTrue(queue[1] is td2)
+        self.assertRaises(ValueError, td1.queue_remove, queue)
+
 
 class TestFormatTime (unittest.TestCase):
     def testBasic(self):
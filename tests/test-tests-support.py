@@ -22,6 +22,7 @@ import logging
 _log = logging.getLogger(__name__)
 
 import unittest
+import collections
 import coapy
 import tests.support
 
@@ -50,10 +51,12 @@ class TestDeterministicBEBO (tests.support.DeterministicBEBO_mixin, unittest.Tes
 
 
 class TestLogHandler (tests.support.LogHandler_mixin, unittest.TestCase):
+    LOG_LEVEL = 1
+
     def testBasic(self):
         self.assertTrue(self.log_handler is not None)
         hdl = self.log_handler
-        self.assertTrue(isinstance(hdl.buffer, list))
+        self.assertTrue(isinstance(hdl.buffer, collections.deque))
         self.assertEqual(0, len(hdl.buffer))
         self.assertTrue(_log.isEnabledFor(logging.ERROR))
         self.assertTrue(_log.isEnabledFor(logging.DEBUG))
@@ -65,6 +68,11 @@ class TestLogHandler (tests.support.LogHandler_mixin, unittest.TestCase):
         self.assertEqual(rec.funcName, 'testBasic')
         hdl.flush()
         self.assertEqual(0, len(hdl.buffer))
+        for i in xrange(self.LOG_CAPACITY + 2):
+            _log.debug('message %d', i)
+        self.assertEqual(self.LOG_CAPACITY, len(hdl.buffer))
+        self.assertEqual(2, hdl.buffer[0].args[0])
+        hdl.flush()
 
 
 class TestFIFOEndpoint (unittest.TestCase):